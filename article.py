@@ -0,0 +1,189 @@
+"""
+Module defining the compact article record passed through the pipeline.
+"""
+import sys
+import hashlib
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+class Article:
+    """
+    Compact, dict-compatible record of a news article.
+
+    Source names are interned, and the formatted texts and content hash are computed
+    once and cached, so every pipeline stage can reuse them.
+    """
+    FIELDS = ("title", "author", "source", "url", "published_at", "content", "description")
+
+    __slots__ = FIELDS + ("_text", "_full_text", "_content_hash")
+
+    def __init__(self,
+                title: Optional[str] = None,
+                author: Optional[str] = None,
+                source: Optional[str] = None,
+                url: Optional[str] = None,
+                published_at: Optional[str] = None,
+                content: Optional[str] = None,
+                description: Optional[str] = None):
+        """
+        Initialize the Article.
+
+        Args:
+            title: Article title.
+            author: Article author.
+            source: Name of the publishing source.
+            url: Article URL.
+            published_at: ISO 8601 publication timestamp.
+            content: Article content (truncated by NewsAPI).
+            description: Article description.
+        """
+        set_field = object.__setattr__
+        set_field(self, "title", title)
+        set_field(self, "author", author)
+        # Thousands of articles share a handful of source names
+        set_field(self, "source", sys.intern(source) if isinstance(source, str) else source)
+        set_field(self, "url", url)
+        set_field(self, "published_at", published_at)
+        set_field(self, "content", content)
+        set_field(self, "description", description)
+        self._clear_cache()
+
+    @classmethod
+    def from_newsapi(cls, raw: Dict[str, Any]) -> "Article":
+        """
+        Create an Article from a raw NewsAPI article.
+
+        Args:
+            raw: Article dictionary as returned by NewsAPI.
+
+        Returns:
+            The Article.
+        """
+        return cls(
+            title=raw.get("title"),
+            author=raw.get("author"),
+            source=raw.get("source", {}).get("name"),
+            url=raw.get("url"),
+            published_at=raw.get("publishedAt"),
+            content=raw.get("content"),
+            description=raw.get("description")
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Article":
+        """
+        Create an Article from a processed article dictionary.
+
+        Args:
+            data: Dictionary with the Article field names as keys.
+
+        Returns:
+            The Article.
+        """
+        if isinstance(data, cls):
+            return data
+        return cls(**{name: data.get(name) for name in cls.FIELDS})
+
+    def _clear_cache(self) -> None:
+        object.__setattr__(self, "_text", None)
+        object.__setattr__(self, "_full_text", None)
+        object.__setattr__(self, "_content_hash", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "source" and isinstance(value, str):
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+        if name in self.FIELDS:
+            self._clear_cache()
+
+    @property
+    def text(self) -> str:
+        """
+        Text used for embedding: title, description and content.
+        Empty if the article has neither a title nor content.
+        """
+        if self._text is None:
+            if not self.title and not self.content:
+                text = ""
+            else:
+                text = f"Title: {self.title}\n\nDescription: {self.description}\n\nContent: {self.content}"
+            object.__setattr__(self, "_text", text)
+        return self._text
+
+    @property
+    def full_text(self) -> str:
+        """
+        Text used for summarization: text plus author and source.
+        """
+        if self._full_text is None:
+            full_text = (
+                f"Title: {self.title}\n\n"
+                f"Author: {self.author}\n"
+                f"Source: {self.source}\n\n"
+                f"Description: {self.description}\n\n"
+                f"Content: {self.content}"
+            )
+            object.__setattr__(self, "_full_text", full_text)
+        return self._full_text
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Stable SHA-256 hex digest of the embedding text.
+        """
+        if self._content_hash is None:
+            digest = hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+            object.__setattr__(self, "_content_hash", digest)
+        return self._content_hash
+
+    # Dict compatibility, so code written against article dictionaries keeps working
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a field by name, like dict.get.
+        """
+        if key not in self.FIELDS:
+            return default
+        return getattr(self, key)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.FIELDS
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((name, getattr(self, name)) for name in self.FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the Article to a plain dictionary.
+        """
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Article):
+            return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Article(title={self.title!r}, source={self.source!r}, url={self.url!r})"
@@ -0,0 +1,251 @@
+"""
+Module for an in-process BM25 inverted index over article texts.
+"""
+import os
+import re
+import json
+import math
+import heapq
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens; "$NVDA" and "NVDA" both become "nvda".
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+class BM25Index:
+    """
+    Inverted index scoring documents with Okapi BM25.
+
+    Each document keeps its term frequencies, so replacing or deleting a document
+    only touches the postings of its own terms. Saved indexes are a JSON snapshot plus a
+    log of documents appended since, replayed on load.
+    """
+    FILE_NAME = "bm25.json"
+    LOG_FILE_NAME = "bm25.log"
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty BM25Index.
+
+        Args:
+            k1: Term frequency saturation.
+            b: Document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Set[str]] = {}
+        self._frequencies: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._topics: Dict[str, Optional[str]] = {}
+        self._total_length = 0
+        self._log_entries = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._frequencies)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._frequencies
+
+    def add(self, ids: List[str], texts: List[str], topics: Optional[List[Optional[str]]] = None) -> None:
+        """
+        Index documents; a document with an existing ID replaces the indexed one.
+
+        Args:
+            ids: Document IDs.
+            texts: Document texts.
+            topics: Topic per document, used to filter searches.
+        """
+        topics = topics or [None] * len(ids)
+        with self._lock:
+            for doc_id, text, topic in zip(ids, texts, topics):
+                self._remove(doc_id)
+                self._insert(doc_id, dict(Counter(tokenize(text))), topic)
+
+    def _insert(self, doc_id: str, frequencies: Dict[str, int], topic: Optional[str]) -> None:
+        self._frequencies[doc_id] = frequencies
+        length = sum(frequencies.values())
+        self._lengths[doc_id] = length
+        self._topics[doc_id] = topic
+        self._total_length += length
+        for term in frequencies:
+            self._postings.setdefault(term, set()).add(doc_id)
+
+    def _remove(self, doc_id: str) -> None:
+        frequencies = self._frequencies.pop(doc_id, None)
+        if frequencies is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        self._topics.pop(doc_id, None)
+        for term in frequencies:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[term]
+
+    def delete(self, ids: Iterable[str]) -> None:
+        """
+        Remove documents from the index.
+        """
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def delete_topic(self, topic: str) -> List[str]:
+        """
+        Remove every document of a topic.
+
+        Returns:
+            The removed document IDs.
+        """
+        with self._lock:
+            ids = [doc_id for doc_id, doc_topic in self._topics.items() if doc_topic == topic]
+            for doc_id in ids:
+                self._remove(doc_id)
+        return ids
+
+    def search(self, query: str, k: int = 10, topic: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Find the documents scoring highest for a query.
+
+        Only the postings of the query terms are read, so the cost depends on how common
+        the terms are rather than on the size of the index.
+
+        Args:
+            query: Query text.
+            k: Maximum number of results.
+            topic: If given, only documents of this topic are returned.
+
+        Returns:
+            (document ID, BM25 score) pairs, best first.
+        """
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = {}
+        with self._lock:
+            count = len(self._frequencies)
+            if not count or not terms:
+                return []
+            average_length = self._total_length / count or 1.0
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1.0 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id in postings:
+                    if topic is not None and self._topics.get(doc_id) != topic:
+                        continue
+                    frequency = self._frequencies[doc_id][term]
+                    norm = self.k1 * (1.0 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def save(self, folder_path: str) -> None:
+        """
+        Save the index as JSON in a folder.
+        """
+        os.makedirs(folder_path, exist_ok=True)
+        path = os.path.join(folder_path, self.FILE_NAME)
+        with self._lock:
+            data = {
+                "k1": self.k1,
+                "b": self.b,
+                "docs": {
+                    doc_id: {"topic": self._topics.get(doc_id), "tf": frequencies}
+                    for doc_id, frequencies in self._frequencies.items()
+                }
+            }
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+        # The snapshot includes everything logged so far
+        log_path = os.path.join(folder_path, self.LOG_FILE_NAME)
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        self._log_entries = 0
+
+    def append(self, folder_path: str, ids: Iterable[str]) -> None:
+        """
+        Append indexed documents to the log in a folder instead of rewriting the whole index.
+
+        Replaced documents are logged again and win on replay. Once the log holds more
+        entries than the index has documents, it is compacted into a full save.
+
+        Args:
+            folder_path: Folder the index was saved to.
+            ids: IDs of documents added or replaced since the last save.
+        """
+        with self._lock:
+            lines = [
+                json.dumps({"id": doc_id, "topic": self._topics.get(doc_id), "tf": self._frequencies[doc_id]})
+                for doc_id in ids if doc_id in self._frequencies
+            ]
+            compact = self._log_entries + len(lines) > len(self._frequencies)
+        if compact:
+            self.save(folder_path)
+            return
+        if not lines:
+            return
+        os.makedirs(folder_path, exist_ok=True)
+        with open(os.path.join(folder_path, self.LOG_FILE_NAME), "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        self._log_entries += len(lines)
+
+    @classmethod
+    def load(cls, folder_path: str) -> Optional["BM25Index"]:
+        """
+        Load an index saved in a folder.
+
+        Returns:
+            The index, or None if none was saved there or it is unreadable.
+        """
+        path = os.path.join(folder_path, cls.FILE_NAME)
+        log_path = os.path.join(folder_path, cls.LOG_FILE_NAME)
+        if not os.path.exists(path) and not os.path.exists(log_path):
+            return None
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                print(f"Warning: BM25 index {path} is unreadable and will be rebuilt.")
+                return None
+        index = cls(k1=data.get("k1", 1.5), b=data.get("b", 0.75))
+        for doc_id, doc in data.get("docs", {}).items():
+            index._insert(doc_id, doc["tf"], doc.get("topic"))
+        if os.path.exists(log_path):
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        doc = json.loads(line)
+                    except ValueError:
+                        # A write interrupted mid-line; the entries before it are intact
+                        break
+                    index._remove(doc["id"])
+                    index._insert(doc["id"], doc["tf"], doc.get("topic"))
+                    index._log_entries += 1
+        return index
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse several rankings with reciprocal rank fusion: score = sum of 1 / (k + rank).
+
+    Args:
+        rankings: Document IDs per ranking, best first.
+        k: Damping constant; larger values flatten the contribution of top ranks.
+
+    Returns:
+        (document ID, fused score) pairs, best first.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
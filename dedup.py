@@ -0,0 +1,343 @@
+"""
+Module for dropping syndicated and near-duplicate articles before they are embedded.
+"""
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from article import Article
+from bm25 import tokenize
+
+# Query parameters that only track the referrer and never change the article
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "cmpid", "ref", "ref_src", "smid", "ocid", "taid", "guccounter"}
+
+TRUNCATION_PATTERN = re.compile(r"\s*\[\+\d+ chars\]\s*$")
+
+SIMHASH_BITS = 64
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Normalize an article URL so copies of the same page compare equal.
+
+    Lowercases the scheme and host, drops "www."/"m." prefixes, tracking parameters,
+    fragments, AMP suffixes and trailing slashes, and sorts the remaining query.
+
+    Args:
+        url: Article URL.
+
+    Returns:
+        The canonical URL, or None if there is no URL.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = re.sub(r"/(amp|amp\.html)/?$", "", parts.path) or "/"
+    if path != "/":
+        path = path.rstrip("/")
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, urlencode(query), ""))
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash of a text over word shingles; similar texts differ in few bits.
+
+    Args:
+        text: Text to fingerprint.
+        shingle_size: Number of words per shingle.
+
+    Returns:
+        The fingerprint as an unsigned 64-bit integer.
+    """
+    tokens = tokenize(text)
+    if len(tokens) >= shingle_size:
+        shingles = Counter(" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1))
+    else:
+        shingles = Counter(tokens)
+    if not shingles:
+        return 0
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles],
+        dtype=np.uint64
+    )
+    weights = np.array(list(shingles.values()), dtype=np.float64)
+    bits = (hashes[:, None] >> np.arange(SIMHASH_BITS, dtype=np.uint64)) & np.uint64(1)
+    votes = weights @ np.where(bits == 1, 1.0, -1.0)
+    return sum(1 << i for i in np.flatnonzero(votes > 0).tolist())
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+class Deduplicator:
+    """
+    Class for collapsing syndicated copies of articles.
+
+    Articles pass three checks: canonical URL, SimHash of the text against a persistent
+    per-topic fingerprint index, and optionally the cosine similarity of their embeddings
+    within the batch. Without a topic only copies within the batch are dropped, which
+    suits picking the articles to summarize. With a topic, copies of articles stored under
+    that topic are dropped too, which suits picking the articles to embed; every topic keeps
+    its own copy of a shared story. An article whose canonical URL was indexed before is not
+    a duplicate of itself, so refreshed articles still reach the embedding store and replace
+    old versions.
+
+    The index is saved as a JSON snapshot plus a log of later changes, so a search
+    appends its new fingerprints instead of rewriting the whole file.
+    """
+    def __init__(self,
+                 storage_file: Optional[str] = "fingerprints.json",
+                 max_hamming_distance: int = 3,
+                 embeddings: Optional[Embeddings] = None,
+                 embedding_threshold: Optional[float] = None,
+                 max_entries: int = 200000):
+        """
+        Initialize the Deduplicator.
+
+        Args:
+            storage_file: JSON file of the fingerprint index; changes are logged to storage_file + ".log".
+                If None, the index is kept in memory only.
+            max_hamming_distance: Largest SimHash bit difference treated as a near-duplicate (at most 7).
+            embeddings: Embedding model for the cosine check, ideally the engine's cached model so the
+                embeddings are reused when the articles are stored.
+            embedding_threshold: Cosine similarity at or above which two articles are duplicates.
+                If None, the embedding check is skipped.
+            max_entries: Maximum number of fingerprints kept per topic; the oldest are forgotten first.
+        """
+        if not 0 <= max_hamming_distance < 8:
+            raise ValueError("max_hamming_distance must be between 0 and 7.")
+        if embedding_threshold is not None and embeddings is None:
+            raise ValueError("embedding_threshold requires an embedding model.")
+        self.storage_file = storage_file
+        self.log_file = storage_file + ".log" if storage_file else None
+        self.max_hamming_distance = max_hamming_distance
+        # Two fingerprints within distance d agree exactly on at least one of d + 1 bands
+        self.bands = max_hamming_distance + 1
+        self.embeddings = embeddings
+        self.embedding_threshold = embedding_threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Changes not yet saved, as (topic, key, fingerprint or None if forgotten)
+        self._pending: List[Tuple[str, str, Optional[int]]] = []
+        self._log_entries = 0
+        self.fingerprints: Dict[str, Dict[str, int]] = self._load_data()
+        self._buckets: Dict[Tuple[str, int, int], Set[str]] = {}
+        for topic, fingerprints in self.fingerprints.items():
+            for key, fingerprint in fingerprints.items():
+                self._index(topic, key, fingerprint)
+        self.stats = {"seen": 0, "url": 0, "simhash": 0, "embedding": 0}
+
+    def _load_data(self) -> Dict[str, Dict[str, int]]:
+        """
+        Load the fingerprint index from the storage file and replay the changes logged since.
+
+        Returns:
+            Dictionary mapping topics to article keys and SimHash fingerprints, oldest first.
+        """
+        fingerprints: Dict[str, Dict[str, int]] = {}
+        if self.storage_file and os.path.exists(self.storage_file):
+            try:
+                with open(self.storage_file, "r") as f:
+                    fingerprints = {
+                        topic: {key: int(value, 16) for key, value in entries.items()}
+                        for topic, entries in json.load(f).items()
+                    }
+            except (json.JSONDecodeError, ValueError, AttributeError):
+                # Start over if the file is corrupted
+                return {}
+        if self.log_file and os.path.exists(self.log_file):
+            with open(self.log_file, "r") as f:
+                for line in f:
+                    try:
+                        topic, key, value = json.loads(line)
+                    except ValueError:
+                        # A write interrupted mid-line; the entries before it are intact
+                        break
+                    entries = fingerprints.setdefault(topic, {})
+                    entries.pop(key, None)
+                    if value is not None:
+                        entries[key] = int(value, 16)
+                    self._log_entries += 1
+        return fingerprints
+
+    def _save_data(self) -> None:
+        """
+        Append unsaved changes to the log, or rewrite the storage file once the log outgrows the index.
+        """
+        if not self.storage_file or not self._pending:
+            return
+        if self._log_entries + len(self._pending) > sum(len(entries) for entries in self.fingerprints.values()):
+            self._write_snapshot()
+            return
+        with open(self.log_file, "a") as f:
+            for topic, key, fingerprint in self._pending:
+                f.write(json.dumps([topic, key, None if fingerprint is None else format(fingerprint, "016x")]) + "\n")
+        self._log_entries += len(self._pending)
+        self._pending = []
+
+    def _write_snapshot(self) -> None:
+        """
+        Save the whole fingerprint index to the storage file and clear the log.
+        """
+        self._pending = []
+        if not self.storage_file:
+            return
+        with open(self.storage_file + ".tmp", "w") as f:
+            json.dump({
+                topic: {key: format(value, "016x") for key, value in entries.items()}
+                for topic, entries in self.fingerprints.items()
+            }, f)
+        os.replace(self.storage_file + ".tmp", self.storage_file)
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+        self._log_entries = 0
+
+    def _band_keys(self, topic: str, fingerprint: int) -> List[Tuple[str, int, int]]:
+        width = SIMHASH_BITS // self.bands
+        mask = (1 << width) - 1
+        return [(topic, band, (fingerprint >> (band * width)) & mask) for band in range(self.bands)]
+
+    def _index(self, topic: str, key: str, fingerprint: int) -> None:
+        for band_key in self._band_keys(topic, fingerprint):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def _unindex(self, topic: str, key: str, fingerprint: int) -> None:
+        for band_key in self._band_keys(topic, fingerprint):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _near_duplicate(self,
+                        topic: str,
+                        key: str,
+                        fingerprint: int,
+                        buckets: Optional[Dict[Tuple[str, int, int], Set[str]]] = None,
+                        fingerprints: Optional[Dict[str, int]] = None) -> Optional[str]:
+        """
+        Key of an article indexed under the topic whose fingerprint is within max_hamming_distance, if any.
+
+        buckets and fingerprints default to the persistent index.
+        """
+        if buckets is None:
+            buckets = self._buckets
+            fingerprints = self.fingerprints.get(topic, {})
+        for band_key in self._band_keys(topic, fingerprint):
+            for other in buckets.get(band_key, ()):
+                if other != key and hamming_distance(fingerprint, fingerprints[other]) <= self.max_hamming_distance:
+                    return other
+        return None
+
+    def _remember(self, topic: str, key: str, fingerprint: int) -> None:
+        fingerprints = self.fingerprints.setdefault(topic, {})
+        previous = fingerprints.pop(key, None)
+        if previous is not None:
+            self._unindex(topic, key, previous)
+        fingerprints[key] = fingerprint
+        self._index(topic, key, fingerprint)
+        if previous != fingerprint:
+            self._pending.append((topic, key, fingerprint))
+        while len(fingerprints) > self.max_entries:
+            oldest = next(iter(fingerprints))
+            self._unindex(topic, oldest, fingerprints.pop(oldest))
+            self._pending.append((topic, oldest, None))
+
+    @staticmethod
+    def _fingerprint_text(article: Union[Article, Dict[str, Any]]) -> str:
+        """
+        Text shared by syndicated copies: description and content without NewsAPI's truncation marker.
+        """
+        content = TRUNCATION_PATTERN.sub("", article.get("content") or "")
+        text = f"{article.get('description') or ''} {content}".strip()
+        return text or (article.get("title") or "")
+
+    def dedupe(self,
+               articles: List[Union[Article, Dict[str, Any]]],
+               topic: Optional[str] = None) -> List[Union[Article, Dict[str, Any]]]:
+        """
+        Drop duplicate articles, keeping the first copy.
+
+        Args:
+            articles: Articles, e.g. from NewsRetriever.get_articles.
+            topic: Topic the articles are stored under. If given, copies of articles indexed
+                under it are dropped as well and the kept articles are recorded in the index;
+                if None, only copies within the batch are dropped and the index is unchanged.
+
+        Returns:
+            The articles that are not duplicates, in their original order.
+        """
+        kept = []
+        with self._lock:
+            batch_keys = set()
+            batch_fingerprints: Dict[str, int] = {}
+            batch_buckets: Dict[Tuple[str, int, int], Set[str]] = {}
+            for article in articles:
+                self.stats["seen"] += 1
+                text = self._fingerprint_text(article)
+                key = canonicalize_url(article.get("url")) or "text:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if key in batch_keys:
+                    self.stats["url"] += 1
+                    continue
+                fingerprint = simhash(text)
+                if fingerprint and (
+                        self._near_duplicate("", key, fingerprint, batch_buckets, batch_fingerprints) is not None
+                        or topic is not None and self._near_duplicate(topic, key, fingerprint) is not None):
+                    self.stats["simhash"] += 1
+                    continue
+                batch_keys.add(key)
+                kept.append((key, fingerprint, article))
+                # Later copies in the same batch are matched against this one
+                if fingerprint:
+                    batch_fingerprints[key] = fingerprint
+                    for band_key in self._band_keys("", fingerprint):
+                        batch_buckets.setdefault(band_key, set()).add(key)
+
+            if self.embedding_threshold is not None and len(kept) > 1:
+                kept = self._drop_similar_embeddings(kept)
+            if topic is not None:
+                for key, fingerprint, _ in kept:
+                    if fingerprint:
+                        self._remember(topic, key, fingerprint)
+                self._save_data()
+        return [article for _, _, article in kept]
+
+    def _drop_similar_embeddings(self, kept: List[Tuple[str, int, Any]]) -> List[Tuple[str, int, Any]]:
+        """
+        Drop articles whose embedding is too close to an earlier article of the batch.
+        """
+        texts = [Article.from_dict(article).text for _, _, article in kept]
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+        similarity = vectors @ vectors.T
+
+        keep = np.ones(len(kept), dtype=bool)
+        for i in range(1, len(kept)):
+            if np.any(similarity[i, :i][keep[:i]] >= self.embedding_threshold):
+                keep[i] = False
+        self.stats["embedding"] += int((~keep).sum())
+        return [entry for entry, keep_entry in zip(kept, keep) if keep_entry]
+
+    def reset(self) -> None:
+        """
+        Forget all fingerprints.
+        """
+        with self._lock:
+            self.fingerprints = {}
+            self._buckets = {}
+            self._write_snapshot()
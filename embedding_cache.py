@@ -0,0 +1,383 @@
+"""
+Module for caching document embeddings on disk, keyed by model and content hash.
+"""
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+class EmbeddingCache:
+    """
+    Class for storing embeddings compactly on disk with size-bounded LRU eviction.
+
+    Vectors live in a raw float32 file with one row per entry and the keys in a text
+    file with one key per line, so new entries are appended without rewriting the cache.
+    """
+    VECTORS_FILE = "vectors.f32"
+    KEYS_FILE = "keys.txt"
+    META_FILE = "meta.json"
+
+    def __init__(self, cache_directory: str = "./vector_db/_embedding_cache", max_entries: int = 100000):
+        """
+        Initialize the EmbeddingCache.
+
+        Args:
+            cache_directory: Directory where the cache files are stored.
+            max_entries: Maximum number of embeddings kept; least recently used ones are evicted.
+        """
+        self.cache_directory = cache_directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._clock = 0
+        self._rows: Dict[str, int] = {}
+        self._last_used: Dict[str, int] = {}
+        self._matrix = None
+        self.dim = None
+        os.makedirs(cache_directory, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """
+        Build the cache key for a text embedded by a model.
+
+        Args:
+            model_name: Name of the embedding model.
+            text: Text that is embedded.
+
+        Returns:
+            Hex digest identifying the model and text.
+        """
+        return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_directory, name)
+
+    def _load(self) -> None:
+        """
+        Load the keys and memory-map the vectors already on disk.
+        """
+        meta_path = self._path(self.META_FILE)
+        if not os.path.exists(meta_path):
+            return
+        try:
+            with open(meta_path, "r") as f:
+                self.dim = json.load(f)["dim"]
+            with open(self._path(self.KEYS_FILE), "r") as f:
+                keys = f.read().split()
+        except (OSError, ValueError, KeyError):
+            print("Warning: Embedding cache is unreadable, starting with an empty cache.")
+            self._reset_files()
+            return
+
+        rows = self._row_count()
+        vectors_path = self._path(self.VECTORS_FILE)
+        vectors_size = os.path.getsize(vectors_path) if os.path.exists(vectors_path) else 0
+        if len(keys) != rows or vectors_size != rows * 4 * self.dim:
+            # An interrupted append can leave the two files out of step. Cut both back to the
+            # rows they share, so later appends put each key beside its own vector.
+            keys = keys[:rows]
+            if os.path.exists(vectors_path):
+                with open(vectors_path, "r+b") as f:
+                    f.truncate(len(keys) * 4 * self.dim)
+            with open(self._path(self.KEYS_FILE), "w") as f:
+                f.write("".join(f"{key}\n" for key in keys))
+        for row, key in enumerate(keys):
+            self._rows[key] = row
+            self._last_used[key] = row
+        self._clock = len(keys)
+        self._remap()
+
+    def _row_count(self) -> int:
+        path = self._path(self.VECTORS_FILE)
+        if not self.dim or not os.path.exists(path):
+            return 0
+        return os.path.getsize(path) // (4 * self.dim)
+
+    def _remap(self) -> None:
+        """
+        Memory-map the vectors file after it changed.
+        """
+        rows = self._row_count()
+        if rows == 0:
+            self._matrix = None
+            return
+        self._matrix = np.memmap(self._path(self.VECTORS_FILE), dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    def _reset_files(self) -> None:
+        for name in (self.VECTORS_FILE, self.KEYS_FILE, self.META_FILE):
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+        self._rows = {}
+        self._last_used = {}
+        self._matrix = None
+        self.dim = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up embeddings.
+
+        Args:
+            keys: Cache keys.
+
+        Returns:
+            One float32 vector per key, or None where the key is not cached.
+        """
+        results = []
+        with self._lock:
+            for key in keys:
+                row = self._rows.get(key)
+                if row is None or self._matrix is None:
+                    results.append(None)
+                    continue
+                self._clock += 1
+                self._last_used[key] = self._clock
+                results.append(np.array(self._matrix[row]))
+        return results
+
+    def put_many(self, keys: List[str], vectors: np.ndarray) -> None:
+        """
+        Store embeddings, appending them to the cache files.
+
+        Args:
+            keys: Cache keys.
+            vectors: Matrix with one embedding per key.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not keys:
+            return
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self._path(self.META_FILE), "w") as f:
+                    json.dump({"dim": self.dim}, f)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match cache dimension {self.dim}.")
+
+            new_keys = []
+            new_rows = []
+            seen = set()
+            for key, vector in zip(keys, vectors):
+                if key in self._rows or key in seen:
+                    continue
+                seen.add(key)
+                new_keys.append(key)
+                new_rows.append(vector)
+            if not new_keys:
+                return
+
+            first_row = self._row_count()
+            with open(self._path(self.VECTORS_FILE), "ab") as f:
+                f.write(np.ascontiguousarray(new_rows, dtype=np.float32).tobytes())
+            with open(self._path(self.KEYS_FILE), "a") as f:
+                f.write("".join(f"{key}\n" for key in new_keys))
+
+            for offset, key in enumerate(new_keys):
+                self._clock += 1
+                self._rows[key] = first_row + offset
+                self._last_used[key] = self._clock
+            self._remap()
+
+            if len(self._rows) > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Keep the most recently used entries and rewrite the files. Caller must hold the lock.
+        """
+        # Evict down to 90% so compaction is not repeated on every insert
+        keep = max(1, int(self.max_entries * 0.9))
+        kept_keys = sorted(self._rows, key=lambda k: self._last_used[k], reverse=True)[:keep]
+        kept_keys.sort(key=lambda k: self._rows[k])
+        vectors = np.array(self._matrix[[self._rows[k] for k in kept_keys]], dtype=np.float32)
+
+        vectors_tmp = self._path(self.VECTORS_FILE + ".tmp")
+        keys_tmp = self._path(self.KEYS_FILE + ".tmp")
+        vectors.tofile(vectors_tmp)
+        with open(keys_tmp, "w") as f:
+            f.write("".join(f"{key}\n" for key in kept_keys))
+
+        # Release the old mapping before replacing the file underneath it
+        self._matrix = None
+        os.replace(vectors_tmp, self._path(self.VECTORS_FILE))
+        os.replace(keys_tmp, self._path(self.KEYS_FILE))
+
+        self._rows = {key: row for row, key in enumerate(kept_keys)}
+        self._last_used = {key: self._last_used[key] for key in kept_keys}
+        self._remap()
+
+    def clear(self) -> None:
+        """
+        Remove all cached embeddings.
+        """
+        with self._lock:
+            self._reset_files()
+
+def embed_queries(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+    """
+    Embed several queries through a model's query path.
+
+    Models may encode queries differently from documents (e.g. HuggingFaceEmbeddings with
+    query_encode_kwargs adding a query prompt), so embed_documents cannot stand in for
+    embed_query. HuggingFaceEmbeddings gets one batched call with its query settings; other
+    models are asked one query at a time.
+
+    Args:
+        embeddings: LangChain compatible embedding model.
+        texts: Queries to embed.
+
+    Returns:
+        One embedding per query, equal to what embed_query returns.
+    """
+    query_encode_kwargs = getattr(embeddings, "query_encode_kwargs", None)
+    if query_encode_kwargs is not None and hasattr(embeddings, "_embed"):
+        return embeddings._embed(texts, query_encode_kwargs or embeddings.encode_kwargs)
+    return [embeddings.embed_query(text) for text in texts]
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves repeated documents from an EmbeddingCache and
+    repeated queries from an in-memory LRU cache.
+    """
+    def __init__(self,
+                 embeddings: Embeddings,
+                 cache: Optional[EmbeddingCache],
+                 model_name: Optional[str] = None,
+                 query_cache_size: int = 1024,
+                 lowercase_queries: bool = False):
+        """
+        Initialize the CachedEmbeddings.
+
+        Args:
+            embeddings: Underlying LangChain compatible embedding model.
+            cache: Cache storing the document embeddings. If None, documents are always embedded.
+            model_name: Name used in cache keys. If None, taken from the model.
+            query_cache_size: Maximum number of query embeddings kept in memory. 0 disables the query cache.
+            lowercase_queries: Whether queries differing only in case share a cache entry (and are
+                embedded lowercased). Only safe for uncased models.
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = (
+            model_name
+            or getattr(embeddings, "model_name", None)
+            or getattr(embeddings, "model", None)
+            or type(embeddings).__name__
+        )
+        self.hits = 0
+        self.misses = 0
+        self.query_cache_size = query_cache_size
+        self.lowercase_queries = lowercase_queries
+        self._queries = OrderedDict()
+        self._query_lock = threading.Lock()
+        self.query_hits = 0
+        self.query_misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, only sending texts that are not cached to the model.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            One embedding per text.
+        """
+        if self.cache is None:
+            return self.embeddings.embed_documents(texts)
+        keys = [EmbeddingCache.make_key(self.model_name, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+
+        # Embed each missing text once, even if it appears several times
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text
+        self.hits += len(texts) - sum(1 for v in vectors if v is None)
+        self.misses += len(missing)
+
+        if missing:
+            computed = np.asarray(self.embeddings.embed_documents(list(missing.values())), dtype=np.float32)
+            self.cache.put_many(list(missing), computed)
+            by_key = dict(zip(missing, computed))
+            vectors = [v if v is not None else by_key[k] for k, v in zip(keys, vectors)]
+
+        return [vector.tolist() for vector in vectors]
+
+    def normalize_query(self, text: str) -> str:
+        """
+        Normalize a query for caching: collapse whitespace, and lowercase if configured.
+        """
+        text = re.sub(r"\s+", " ", text).strip()
+        return text.lower() if self.lowercase_queries else text
+
+    def _cached_queries(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up normalized queries in the LRU cache, counting hits and misses.
+        """
+        results = []
+        with self._query_lock:
+            for text in texts:
+                vector = self._queries.get((self.model_name, text))
+                if vector is None:
+                    self.query_misses += 1
+                else:
+                    self._queries.move_to_end((self.model_name, text))
+                    self.query_hits += 1
+                results.append(vector)
+        return results
+
+    def _cache_queries(self, texts: List[str], vectors: List[List[float]]) -> None:
+        with self._query_lock:
+            for text, vector in zip(texts, vectors):
+                self._queries[(self.model_name, text)] = vector
+                self._queries.move_to_end((self.model_name, text))
+            while len(self._queries) > self.query_cache_size:
+                self._queries.popitem(last=False)
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a query, serving recurring queries from the LRU cache.
+        """
+        if self.query_cache_size <= 0:
+            return self.embeddings.embed_query(text)
+        text = self.normalize_query(text)
+        vector = self._cached_queries([text])[0]
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self._cache_queries([text], [vector])
+        return list(vector)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several queries, sending the ones not in the LRU cache to the model together.
+        """
+        if self.query_cache_size <= 0:
+            return embed_queries(self.embeddings, texts)
+        texts = [self.normalize_query(text) for text in texts]
+        vectors = self._cached_queries(texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            computed = embed_queries(self.embeddings, missing)
+            self._cache_queries(missing, computed)
+            by_text = dict(zip(missing, computed))
+            vectors = [vector if vector is not None else by_text[text] for text, vector in zip(texts, vectors)]
+        return [list(vector) for vector in vectors]
+
+    def clear_query_cache(self) -> None:
+        """
+        Remove all cached query embeddings.
+        """
+        with self._query_lock:
+            self._queries.clear()
@@ -3,13 +3,34 @@ Module for creating and managing article embeddings.
 """
 import os
 import re
-from typing import List, Dict, Any, Optional
+import shutil
+import hashlib
+import time
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 import numpy as np
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
-from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 
+from article import Article
+from embedding_cache import EmbeddingCache, CachedEmbeddings, embed_queries
+from numpy_store import NumpyVectorStore
+from bm25 import BM25Index, reciprocal_rank_fusion
+from mmr import maximal_marginal_relevance
+from quantization import SUPPORTED_DTYPES
+from faiss_index import (
+    FLAT_SPEC, FAISS_QUANTIZED_SPECS, normalize_index_spec, build_faiss_index, apply_search_params,
+    is_flat_index, has_stable_labels, load_faiss_serving, search_faiss_subset
+)
+
+# Store holding every topic when the engine runs with unified=True. Sanitized topics
+# never start with "_", so the directory cannot clash with a per-topic store.
+UNIFIED_STORE = "_all"
+UNIFIED_COLLECTION = "all_topics"
+
 class EmbeddingEngine:
     """
     Class for creating and managing article embeddings.
@@ -17,24 +38,94 @@ class EmbeddingEngine:
     def __init__(self, 
                 embedding_model: Optional[Embeddings] = None, 
                 vector_store_type: str = "chroma",
-                persist_directory: str = "./vector_db"):
+                persist_directory: str = "./vector_db",
+                embedding_cache_size: Optional[int] = 100000,
+                store_cache_size: int = 8,
+                faiss_index_spec: str = FLAT_SPEC,
+                faiss_search_params: Optional[Dict[str, Any]] = None,
+                faiss_train_sample_size: int = 50000,
+                read_only: bool = False,
+                vector_dtype: str = "float32",
+                rescore_factor: int = 4,
+                unified: bool = False,
+                query_cache_size: int = 1024,
+                lexical_index: bool = True):
         """
         Initialize the EmbeddingEngine with embedding model and vector store.
         
         Args:
             embedding_model: LangChain compatible embedding model.
-            vector_store_type: Type of vector store to use ("chroma" or "faiss").
+            vector_store_type: Type of vector store to use ("chroma", "faiss" or "numpy").
             persist_directory: Directory to persist vector store.
+            embedding_cache_size: Maximum number of article embeddings cached on disk. None or 0 disables the cache.
+            store_cache_size: Maximum number of opened topic vector stores kept for reuse.
+            faiss_index_spec: FAISS index type ("Flat", "IVF<nlist>", "HNSW<M>", "IVF<nlist>,PQ<m>").
+            faiss_search_params: FAISS search parameters, e.g. {"nprobe": 16} or {"efSearch": 64}.
+            faiss_train_sample_size: Maximum number of vectors used to train IVF/PQ indexes.
+            read_only: Serving mode. FAISS indexes and NumPy matrices are memory-mapped (FAISS docstores
+                load lazily), so worker processes share the pages; writes are rejected.
+            vector_dtype: Storage type of the searched vectors ("float32", "float16" or "int8"). NumPy stores
+                scan the compact vectors and rescore the best candidates in float32; a flat FAISS index
+                becomes a scalar-quantized one ("SQfp16" or "SQ8"). Not supported with Chroma.
+            rescore_factor: For NumPy stores, candidates per result rescored with the float32 vectors.
+                0 disables rescoring.
+            unified: Keep all topics in one store ({persist_directory}/_all) and filter searches by the
+                "topic" metadata, instead of one store per topic. Enables cross-topic search (topic=None).
+            query_cache_size: Maximum number of query embeddings kept in an in-memory LRU cache. 0 disables it.
+            lexical_index: Keep a BM25 index of the stored texts beside each store, for hybrid_search_articles.
         """
-        # Updated to use non-deprecated HuggingFaceEmbeddings
-        self.embedding_model = embedding_model or HuggingFaceEmbeddings(
-            model_name="all-MiniLM-L6-v2"
-        )
+        if vector_dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {vector_dtype}")
+        if vector_dtype != "float32" and vector_store_type.lower() == "chroma":
+            raise ValueError("vector_dtype requires vector_store_type 'numpy' or 'faiss'.")
+
+        # Updated to use non-deprecated HuggingFaceEmbeddings; imported only when no model is given
+        if embedding_model is None:
+            from langchain_huggingface import HuggingFaceEmbeddings
+            embedding_model = HuggingFaceEmbeddings(
+                model_name="all-MiniLM-L6-v2"
+            )
+        self.embedding_model = embedding_model
+        
+        # Serve unchanged articles from the content-hash cache instead of re-encoding them,
+        # and recurring queries from memory
+        if embedding_cache_size or query_cache_size:
+            cache = None
+            if embedding_cache_size:
+                cache = EmbeddingCache(f"{persist_directory}/_embedding_cache", max_entries=embedding_cache_size)
+            self.embedding_model = CachedEmbeddings(
+                self.embedding_model,
+                cache,
+                query_cache_size=query_cache_size or 0
+            )
         
         self.vector_store_type = vector_store_type.lower()
         self.persist_directory = persist_directory
         self.vector_store = None
         os.makedirs(persist_directory, exist_ok=True)
+        
+        self.faiss_index_spec = normalize_index_spec(faiss_index_spec)
+        if self.faiss_index_spec == FLAT_SPEC and vector_dtype != "float32":
+            self.faiss_index_spec = FAISS_QUANTIZED_SPECS[vector_dtype]
+        self.faiss_search_params = faiss_search_params or {}
+        self.faiss_train_sample_size = faiss_train_sample_size
+        self.read_only = read_only
+        self.vector_dtype = vector_dtype
+        self.rescore_factor = rescore_factor
+        self.unified = unified
+        
+        # Opened stores per sanitized topic, least recently used first
+        self.store_cache_size = store_cache_size
+        self._store_cache = OrderedDict()
+        self._store_lock = threading.Lock()
+        # FAISS labels per topic of a unified store, as (store, {topic: labels}) per store name
+        self._faiss_topic_labels: Dict[str, Any] = {}
+        
+        # BM25 indexes per store name, loaded or built on first use
+        self.lexical_index = lexical_index
+        self._lexical_indexes: Dict[str, BM25Index] = {}
+        # Store names whose document IDs have been checked against the URL-hash scheme
+        self._keyed_stores = set()
     
     def _sanitize_topic(self, topic: str) -> str:
         """
@@ -54,87 +145,1151 @@ class EmbeddingEngine:
         # Ensure the topic is not more than 63 characters
         return topic[:63]
 
-    def create_embeddings(self, articles: List[Dict[str, Any]], topic: str) -> None:
+    def _store_name(self, topic: str) -> str:
         """
-        Create embeddings for articles and store them in the vector store.
+        Name of the store holding a sanitized topic.
         """
-        topic = self._sanitize_topic(topic)
+        return UNIFIED_STORE if self.unified else topic
+
+    def _topic_filter(self, topic: Optional[str]) -> Optional[Dict[str, str]]:
+        """
+        Metadata filter selecting a sanitized topic in the unified store.
+        """
+        return {"topic": topic} if self.unified and topic is not None else None
+
+    def _document_id(self, article: Union[Article, Dict[str, Any]], content: str, topic: str) -> str:
+        """
+        Build a deterministic document ID from the article URL, or its content if it has no URL.
+        
+        In the unified store the topic is part of the ID, so an article stored under
+        several topics keeps one document per topic.
+        """
+        basis = article.get("url") or content
+        if self.unified:
+            basis = f"{topic}\x00{basis}"
+        return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+    def _prepare_documents(self, articles: List[Union[Article, Dict[str, Any]]], topic: str):
+        """
+        Build the IDs, texts and metadata for articles, skipping empty and repeated ones.
+        """
+        ids = []
         texts = []
         metadatas = []
+        seen = set()
         
         # Filter out articles with empty content
         for article in articles:
             content = self._get_article_content(article)
             if not content:
                 continue
+            doc_id = self._document_id(article, content, topic)
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            ids.append(doc_id)
             texts.append(content)
             metadatas.append({
-                "title": article.get("title", ""),
-                "url": article.get("url", ""),
-                "source": article.get("source", ""),
-                "published_at": article.get("published_at", ""),
-                "topic": topic
+                "title": article.get("title") or "",
+                "url": article.get("url") or "",
+                "source": article.get("source") or "",
+                "published_at": article.get("published_at") or "",
+                "topic": topic,
+                "content_hash": hashlib.sha256(content.encode("utf-8")).hexdigest()
             })
+        return ids, texts, metadatas
+
+    def _stored_hashes(self, vector_store, ids: List[str]) -> Dict[str, str]:
+        """
+        Look up the content hashes of documents already in the store.
+        """
+        hashes = {}
+        if self.vector_store_type == "chroma":
+            existing = vector_store.get(ids=ids, include=["metadatas"])
+            for doc_id, metadata in zip(existing["ids"], existing["metadatas"]):
+                hashes[doc_id] = (metadata or {}).get("content_hash", "")
+        elif self.vector_store_type == "faiss":
+            for doc_id in ids:
+                doc = vector_store.docstore.search(doc_id)
+                # InMemoryDocstore returns a message string for unknown IDs
+                if hasattr(doc, "metadata"):
+                    hashes[doc_id] = doc.metadata.get("content_hash", "")
+        elif self.vector_store_type == "numpy":
+            for doc_id in ids:
+                metadata = vector_store.get_metadata(doc_id)
+                if metadata is not None:
+                    hashes[doc_id] = metadata.get("content_hash", "")
+        return hashes
+
+    def _load_faiss(self, topic: str):
+        """
+        Load the persisted FAISS index for a topic, or None if there is none yet.
+        """
+        path = f"{self.persist_directory}/{topic}"
+        if not os.path.exists(os.path.join(path, "index.faiss")):
+            return None
+        if self.read_only:
+            vector_store = load_faiss_serving(path, self.embedding_model)
+        else:
+            from langchain_community.vectorstores import FAISS
+            vector_store = FAISS.load_local(path, self.embedding_model)
+        apply_search_params(vector_store.index, self.faiss_search_params)
+        return vector_store
+
+    def _new_faiss_store(self,
+                         texts: List[str],
+                         metadatas: List[Dict[str, Any]],
+                         ids: List[str],
+                         embeddings: Optional[List[List[float]]] = None,
+                         index_spec: Optional[str] = None):
+        """
+        Create a FAISS store holding the given documents.
         
-        if not texts:
-            print("Warning: No valid article content found to create embeddings.")
+        The index type is index_spec, or the configured one if None.
+        """
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        
+        index_spec = index_spec or self.faiss_index_spec
+        if index_spec == FLAT_SPEC:
+            if embeddings is None:
+                return FAISS.from_texts(
+                    texts=texts,
+                    embedding=self.embedding_model,
+                    metadatas=metadatas,
+                    ids=ids
+                )
+            return FAISS.from_embeddings(
+                text_embeddings=list(zip(texts, embeddings)),
+                embedding=self.embedding_model,
+                metadatas=metadatas,
+                ids=ids
+            )
+        
+        if embeddings is None:
+            embeddings = self.embedding_model.embed_documents(texts)
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        index = build_faiss_index(
+            vectors,
+            spec=index_spec,
+            train_sample_size=self.faiss_train_sample_size,
+            search_params=self.faiss_search_params
+        )
+        vector_store = FAISS(
+            embedding_function=self.embedding_model,
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={}
+        )
+        self._add_faiss_documents(vector_store, texts, metadatas, ids, vectors)
+        return vector_store
+
+    def rebuild_faiss_index(self, topic: str) -> None:
+        """
+        Rebuild a topic's FAISS index with the configured index type, retraining it on its vectors.
+        
+        Useful once a topic that started on a flat fallback index has grown enough to train an
+        IVF/PQ index, or after changing faiss_index_spec.
+        
+        Args:
+            topic: Topic whose index is rebuilt.
+        """
+        if self.vector_store_type != "faiss":
+            raise ValueError("rebuild_faiss_index requires vector_store_type='faiss'.")
+        self._check_writable()
+        topic = self._store_name(self._sanitize_topic(topic))
+        vector_store = self._get_store(topic)
+        if vector_store is None or vector_store.index.ntotal == 0:
             return
-            
-        # Updated to use non-deprecated Chroma
+        
+        rebuilt = self._rebuild_faiss_store(vector_store)
+        self.vector_store = rebuilt
+        self._persist_store(topic)
+        self._cache_store(topic, rebuilt)
+
+    def _rebuild_faiss_store(self, vector_store, exclude_ids: Optional[List[str]] = None):
+        """
+        Build a new FAISS store of the configured index type from a store's documents.
+        
+        Documents in exclude_ids are left out and removed from the docstore. This is how
+        documents are removed from HNSW indexes, which cannot remove vectors, and from SQ/PQ
+        indexes saved without an ID map.
+        """
+        import faiss
+        from langchain_community.vectorstores import FAISS
+        
+        exclude = set(exclude_ids or ())
+        kept = [
+            (position, doc_id) for position, doc_id in sorted(vector_store.index_to_docstore_id.items())
+            if doc_id not in exclude
+        ]
+        removed = [doc_id for doc_id in vector_store.index_to_docstore_id.values() if doc_id in exclude]
+        if removed:
+            vector_store.docstore.delete(removed)
+        
+        if not kept:
+            index = faiss.IndexFlatL2(vector_store.index.d)
+        else:
+            source = faiss.downcast_index(vector_store.index)
+            if is_flat_index(source) or isinstance(source, faiss.IndexHNSW) and is_flat_index(source.storage):
+                # Exact vectors are stored; HNSW labels are positions in its storage
+                vectors = source.reconstruct_n(0, source.ntotal)[[p for p, _ in kept]]
+            else:
+                # Compressed indexes cannot return exact vectors; re-embed (served by the embedding cache)
+                texts = [vector_store.docstore.search(doc_id).page_content for _, doc_id in kept]
+                vectors = np.asarray(self.embedding_model.embed_documents(texts), dtype=np.float32)
+            index = build_faiss_index(
+                vectors,
+                spec=self.faiss_index_spec,
+                train_sample_size=self.faiss_train_sample_size,
+                search_params=self.faiss_search_params
+            )
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            if has_stable_labels(index):
+                index.add_with_ids(vectors, np.arange(len(kept), dtype=np.int64))
+            else:
+                index.add(vectors)
+        
+        return FAISS(
+            embedding_function=self.embedding_model,
+            index=index,
+            docstore=vector_store.docstore,
+            index_to_docstore_id={new: doc_id for new, (_, doc_id) in enumerate(kept)}
+        )
+
+    def _remove_faiss_documents(self, vector_store, ids: List[str]):
+        """
+        Remove documents from a FAISS store, returning the store that holds the rest.
+        
+        Flat, IVF and ID-mapped indexes remove the vectors in place; other indexes (HNSW) are rebuilt.
+        """
+        if is_flat_index(vector_store.index):
+            vector_store.delete(ids)
+            return vector_store
+        if not has_stable_labels(vector_store.index):
+            return self._rebuild_faiss_store(vector_store, exclude_ids=ids)
+        
+        # LangChain's FAISS.delete renumbers the labels, which these indexes do not do
+        remove = set(ids)
+        labels = [label for label, doc_id in vector_store.index_to_docstore_id.items() if doc_id in remove]
+        if labels:
+            vector_store.index.remove_ids(np.asarray(labels, dtype=np.int64))
+            vector_store.docstore.delete([vector_store.index_to_docstore_id.pop(label) for label in labels])
+        return vector_store
+    
+    def _add_faiss_documents(self,
+                             vector_store,
+                             texts: List[str],
+                             metadatas: List[Dict[str, Any]],
+                             ids: List[str],
+                             embeddings: Optional[List[List[float]]] = None) -> None:
+        """
+        Add documents to a FAISS store, embedding them unless embeddings are given.
+        """
+        if not has_stable_labels(vector_store.index):
+            if embeddings is None:
+                vector_store.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+            else:
+                vector_store.add_embeddings(
+                    text_embeddings=list(zip(texts, np.asarray(embeddings).tolist())),
+                    metadatas=metadatas,
+                    ids=ids
+                )
+            return
+        
+        if embeddings is None:
+            embeddings = self.embedding_model.embed_documents(texts)
+        # Labels are never reused, so removed documents leave gaps instead of shifting the others
+        start = max(vector_store.index_to_docstore_id, default=-1) + 1
+        labels = np.arange(start, start + len(ids), dtype=np.int64)
+        vector_store.index.add_with_ids(np.ascontiguousarray(embeddings, dtype=np.float32), labels)
+        vector_store.docstore.add({
+            doc_id: Document(id=doc_id, page_content=text, metadata=metadata)
+            for doc_id, text, metadata in zip(ids, texts, metadatas)
+        })
+        vector_store.index_to_docstore_id.update(zip(labels.tolist(), ids))
+
+    def _open_store(self, topic: str):
+        """
+        Open the vector store for a store name, or None if a FAISS or NumPy store does not exist yet.
+        """
         if self.vector_store_type == "chroma":
-            self.vector_store = Chroma(
+            from langchain_chroma import Chroma
+            return Chroma(
                 embedding_function=self.embedding_model,
                 persist_directory=f"{self.persist_directory}/{topic}",
-                collection_name=topic
+                collection_name=UNIFIED_COLLECTION if topic == UNIFIED_STORE else topic
             )
-            self.vector_store.add_texts(texts=texts, metadatas=metadatas)
-            # No longer need to call persist() since Chroma persists automatically
         elif self.vector_store_type == "faiss":
-            self.vector_store = FAISS.from_texts(
-                texts=texts,
-                embedding=self.embedding_model,
-                metadatas=metadatas
+            return self._load_faiss(topic)
+        elif self.vector_store_type == "numpy":
+            # Memory-map only when serving; a writable store is saved over its own file
+            return NumpyVectorStore.load(
+                f"{self.persist_directory}/{topic}",
+                self.embedding_model,
+                mmap=self.read_only,
+                vector_dtype=self.vector_dtype,
+                rescore_factor=self.rescore_factor
             )
+        raise ValueError(f"Unsupported vector store type: {self.vector_store_type}")
+
+    def _get_store(self, topic: str):
+        """
+        Get the vector store for a store name from the LRU cache, opening it on a miss.
+        """
+        with self._store_lock:
+            if topic in self._store_cache:
+                self._store_cache.move_to_end(topic)
+                return self._store_cache[topic]
+        
+        vector_store = self._open_store(topic)
+        if vector_store is not None:
+            self._cache_store(topic, vector_store)
+        return vector_store
+
+    def _cache_store(self, topic: str, vector_store) -> None:
+        """
+        Put an opened store in the LRU cache, replacing any stale handle for the topic.
+        """
+        with self._store_lock:
+            # Every write ends here; labels may have been renumbered
+            self._faiss_topic_labels.pop(topic, None)
+        if self.store_cache_size <= 0:
+            return
+        with self._store_lock:
+            self._store_cache[topic] = vector_store
+            self._store_cache.move_to_end(topic)
+            while len(self._store_cache) > self.store_cache_size:
+                self._store_cache.popitem(last=False)
+
+    def invalidate_store(self, topic: Optional[str] = None) -> None:
+        """
+        Drop cached store handles so the next search reopens them.
+        
+        Args:
+            topic: Topic to invalidate. If None, all cached stores are dropped.
+        """
+        with self._store_lock:
+            if topic is None:
+                self._store_cache.clear()
+                self._lexical_indexes.clear()
+                self._faiss_topic_labels.clear()
+            else:
+                store_name = self._store_name(self._sanitize_topic(topic))
+                self._store_cache.pop(store_name, None)
+                self._lexical_indexes.pop(store_name, None)
+                self._faiss_topic_labels.pop(store_name, None)
+
+    def create_embeddings(self, articles: List[Union[Article, Dict[str, Any]]], topic: str) -> None:
+        """
+        Create embeddings for articles and upsert them into the vector store.
+        
+        Documents are identified by a hash of the article URL, so refreshing a topic skips
+        articles that are already stored unchanged and replaces the ones whose content changed.
+        Documents an older version stored under random IDs are re-keyed on the first write.
+        """
+        self._check_writable()
+        topic = self._sanitize_topic(topic)
+        ids, texts, metadatas = self._prepare_documents(articles, topic)
+        
+        if not texts:
+            print("Warning: No valid article content found to create embeddings.")
+            return
+            
+        # Updated to use non-deprecated Chroma; reuse the cached handle if the topic is open
+        store_name = self._store_name(topic)
+        self.vector_store = self._migrate_document_ids(store_name, self._get_store(store_name))
+        
+        # Only write documents that are new or whose content changed
+        ids, texts, metadatas, changed_ids = self._pending_documents(self.vector_store, ids, texts, metadatas)
+        if not ids:
+            return
+        self._write_documents(store_name, ids, texts, metadatas, changed_ids)
+    
+    def ingest_articles(self,
+                        articles: Iterable[Union[Article, Dict[str, Any]]],
+                        topic: str,
+                        batch_size: int = 256,
+                        num_workers: int = 1,
+                        num_threads: Optional[int] = None,
+                        progress: bool = True) -> Dict[str, float]:
+        """
+        Embed and store a large stream of articles in batches.
+        
+        Articles are consumed lazily (e.g. from NewsRetriever.iter_articles), encoded batch by
+        batch, and upserted like create_embeddings. The FAISS index is saved once at the end.
+        
+        Args:
+            articles: Articles to ingest; any iterable, including generators.
+            topic: Topic to store the articles under.
+            batch_size: Number of articles encoded per model call.
+            num_workers: Number of batches encoded concurrently.
+            num_threads: Intra-op threads for the embedding model (torch). If None, left unchanged.
+            progress: Whether to print per-batch progress and throughput.
+            
+        Returns:
+            Ingestion statistics: documents seen, written and skipped, seconds and docs/sec.
+        """
+        self._check_writable()
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if num_threads:
+            self._set_num_threads(num_threads)
+        
+        topic = self._sanitize_topic(topic)
+        store_name = self._store_name(topic)
+        self.vector_store = self._migrate_document_ids(store_name, self._get_store(store_name))
+        # A new trained index starts flat and is trained on a sample of the whole ingest at the
+        # end, rather than on whatever the first batch holds
+        new_index_spec = FLAT_SPEC if self.vector_store is None and self.vector_store_type == "faiss" else None
+        stats = {"documents": 0, "written": 0, "skipped": 0}
+        started = time.perf_counter()
+        
+        def encode(batch):
+            batch_started = time.perf_counter()
+            ids, texts, metadatas = self._prepare_documents(batch, topic)
+            ids, texts, metadatas, changed_ids = self._pending_documents(self.vector_store, ids, texts, metadatas)
+            embeddings = self.embedding_model.embed_documents(texts) if texts else []
+            return len(batch), ids, texts, metadatas, changed_ids, embeddings, batch_started
+        
+        def write(batch_number, result):
+            batch_len, ids, texts, metadatas, changed_ids, embeddings, batch_started = result
+            if ids and num_workers > 1:
+                # Batches encoded side by side may carry the same article; keep only what is still pending
+                stored = self._stored_hashes(self.vector_store, ids) if self.vector_store is not None else {}
+                keep = [i for i, doc_id in enumerate(ids) if stored.get(doc_id) != metadatas[i]["content_hash"]]
+                ids = [ids[i] for i in keep]
+                texts = [texts[i] for i in keep]
+                metadatas = [metadatas[i] for i in keep]
+                embeddings = [embeddings[i] for i in keep]
+                changed_ids = [doc_id for doc_id in ids if doc_id in stored]
+            if ids:
+                self._write_documents(
+                    store_name, ids, texts, metadatas, changed_ids, embeddings=embeddings, persist=False,
+                    faiss_index_spec=new_index_spec
+                )
+            stats["documents"] += batch_len
+            stats["written"] += len(ids)
+            stats["skipped"] += batch_len - len(ids)
+            if progress:
+                elapsed = time.perf_counter() - batch_started
+                rate = batch_len / elapsed if elapsed > 0 else float("inf")
+                print(f"Batch {batch_number}: {batch_len} articles, {len(ids)} written in {elapsed:.2f}s ({rate:.1f} docs/sec)")
+        
+        batches = self._batched(articles, batch_size)
+        if num_workers <= 1:
+            for batch_number, batch in enumerate(batches, 1):
+                write(batch_number, encode(batch))
+        else:
+            # Encode ahead on worker threads, but write batches in order on this thread
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                in_flight = deque()
+                batch_number = 0
+                for batch in batches:
+                    in_flight.append(executor.submit(encode, batch))
+                    if len(in_flight) >= num_workers * 2:
+                        batch_number += 1
+                        write(batch_number, in_flight.popleft().result())
+                while in_flight:
+                    batch_number += 1
+                    write(batch_number, in_flight.popleft().result())
+        
+        if self.vector_store is not None and stats["written"]:
+            if (self.vector_store_type == "faiss" and self.faiss_index_spec != FLAT_SPEC
+                    and is_flat_index(self.vector_store.index)):
+                # Train the configured index on everything ingested, from the exact flat vectors
+                self.rebuild_faiss_index(topic)
+            else:
+                self._persist_store(store_name)
+        
+        stats["seconds"] = time.perf_counter() - started
+        stats["docs_per_sec"] = stats["documents"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+        if progress:
+            print(
+                f"Ingested {stats['documents']} articles ({stats['written']} written, {stats['skipped']} skipped) "
+                f"in {stats['seconds']:.2f}s ({stats['docs_per_sec']:.1f} docs/sec)"
+            )
+        return stats
+    
+    def _migrate_document_ids(self, store_name: str, vector_store):
+        """
+        Re-key documents stored under other IDs to their URL-hash IDs, keeping one per URL.
+        
+        Stores written before IDs were derived from the URL hold random UUIDs, so upserts would
+        add a second copy of every article next to the old one. This runs once per store and
+        reuses the stored vectors where the store keeps them. Returns the store to write to.
+        """
+        if vector_store is None or store_name in self._keyed_stores:
+            return vector_store
+        ids, texts, metadatas = self._store_documents(vector_store)
+        present = set(ids)
+        stale_ids = []
+        old_ids = []
+        new_ids = []
+        new_texts = []
+        new_metadatas = []
+        for doc_id, text, metadata in zip(ids, texts, metadatas):
+            metadata = dict(metadata or {})
+            key = self._document_id(metadata, text, metadata.get("topic"))
+            if key == doc_id:
+                continue
+            stale_ids.append(doc_id)
+            if key in present:
+                # Another copy of this article is already stored under its key
+                continue
+            present.add(key)
+            metadata.setdefault("content_hash", hashlib.sha256(text.encode("utf-8")).hexdigest())
+            old_ids.append(doc_id)
+            new_ids.append(key)
+            new_texts.append(text)
+            new_metadatas.append(metadata)
+        
+        if stale_ids:
+            print(
+                f"Migrating {len(stale_ids)} documents in '{store_name}' to URL-based IDs "
+                f"({len(stale_ids) - len(new_ids)} duplicates dropped)."
+            )
+            embeddings = self._document_vectors(vector_store, old_ids, new_texts) if new_ids else None
+            # Load the BM25 index before deleting, so one built from the store still has the old IDs
+            lexical_index = self._get_lexical_index(store_name, vector_store)
+            if self.vector_store_type == "chroma":
+                vector_store.delete(ids=stale_ids)
+            elif self.vector_store_type == "numpy":
+                vector_store.delete(stale_ids)
+            else:
+                vector_store = self._remove_faiss_documents(vector_store, stale_ids)
+            if lexical_index is not None:
+                lexical_index.delete(stale_ids)
+            
+            self.vector_store = vector_store
+            if new_ids:
+                self._write_documents(
+                    store_name, new_ids, new_texts, new_metadatas, [], embeddings=embeddings, persist=False
+                )
+            else:
+                self._cache_store(store_name, vector_store)
+            self._persist_store(store_name)
+            vector_store = self.vector_store
+        
+        with self._store_lock:
+            self._keyed_stores.add(store_name)
+        return vector_store
+    
+    def _batched(self, items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+        """
+        Split an iterable into lists of at most batch_size items, lazily.
+        """
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    def _set_num_threads(self, num_threads: int) -> None:
+        """
+        Set the intra-op thread count of the embedding backend, if torch is available.
+        """
+        try:
+            import torch
+        except ImportError:
+            print("Warning: torch is not installed; num_threads is ignored.")
+            return
+        torch.set_num_threads(num_threads)
+    
+    def _check_writable(self) -> None:
+        """
+        Reject writes in read-only serving mode.
+        """
+        if self.read_only:
+            raise ValueError("EmbeddingEngine is in read-only serving mode; writes are disabled.")
+    
+    def _pending_documents(self, vector_store, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]):
+        """
+        Keep only documents that are new or whose content changed, and list the changed IDs.
+        """
+        stored = self._stored_hashes(vector_store, ids) if vector_store is not None and ids else {}
+        pending = [
+            i for i, (doc_id, metadata) in enumerate(zip(ids, metadatas))
+            if stored.get(doc_id) != metadata["content_hash"]
+        ]
+        ids = [ids[i] for i in pending]
+        texts = [texts[i] for i in pending]
+        metadatas = [metadatas[i] for i in pending]
+        changed_ids = [doc_id for doc_id in ids if doc_id in stored]
+        return ids, texts, metadatas, changed_ids
+    
+    def _write_documents(self,
+                         topic: str,
+                         ids: List[str],
+                         texts: List[str],
+                         metadatas: List[Dict[str, Any]],
+                         changed_ids: List[str],
+                         embeddings: Optional[List[List[float]]] = None,
+                         persist: bool = True,
+                         faiss_index_spec: Optional[str] = None) -> None:
+        """
+        Upsert documents into the named store, embedding them unless embeddings are given.
+        
+        faiss_index_spec overrides the configured index type if a new FAISS store is created.
+        """
+        if self.vector_store_type == "chroma":
+            # Chroma upserts by ID, replacing changed documents in place
+            if embeddings is None:
+                self.vector_store.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+            else:
+                self.vector_store._collection.upsert(
+                    ids=ids,
+                    embeddings=[list(map(float, e)) for e in embeddings],
+                    metadatas=metadatas,
+                    documents=texts
+                )
+            # No longer need to call persist() since Chroma persists automatically
+        elif self.vector_store_type == "numpy":
+            if self.vector_store is None:
+                self.vector_store = NumpyVectorStore(
+                    self.embedding_model,
+                    vector_dtype=self.vector_dtype,
+                    rescore_factor=self.rescore_factor
+                )
+            # Rows with an existing ID are replaced in place
+            if embeddings is None:
+                self.vector_store.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+            else:
+                self.vector_store.add_embeddings(
+                    text_embeddings=list(zip(texts, embeddings)),
+                    metadatas=metadatas,
+                    ids=ids
+                )
+        elif self.vector_store is None:
+            self.vector_store = self._new_faiss_store(texts, metadatas, ids, embeddings, faiss_index_spec)
+        else:
+            if changed_ids:
+                self.vector_store = self._remove_faiss_documents(self.vector_store, changed_ids)
+            self._add_faiss_documents(self.vector_store, texts, metadatas, ids, embeddings)
+        
+        lexical_index = self._get_lexical_index(topic, self.vector_store)
+        if lexical_index is not None and ids:
+            lexical_index.add(ids, texts, [metadata.get("topic") for metadata in metadatas])
+        
+        if persist:
+            self._persist_store(topic, lexical_ids=ids)
+        
+        # Searches on this topic must see the documents just written
+        self._cache_store(topic, self.vector_store)
+    
+    def _persist_store(self, topic: str, lexical_ids: Optional[List[str]] = None) -> None:
+        """
+        Save the current FAISS or NumPy store and the store's BM25 index to disk; Chroma
+        persists on its own.
+        
+        Args:
+            topic: Store name.
+            lexical_ids: If given, only these documents are appended to the BM25 log
+                instead of rewriting the whole BM25 index.
+        """
+        if self.vector_store_type == "faiss":
             self.vector_store.save_local(f"{self.persist_directory}/{topic}")
+        elif self.vector_store_type == "numpy":
+            self.vector_store.save(f"{self.persist_directory}/{topic}")
+        lexical_index = self._lexical_indexes.get(topic)
+        if lexical_index is None:
+            return
+        if lexical_ids is None:
+            lexical_index.save(f"{self.persist_directory}/{topic}")
         else:
-            raise ValueError(f"Unsupported vector store type: {self.vector_store_type}")
+            lexical_index.append(f"{self.persist_directory}/{topic}", lexical_ids)
+    
+    def _get_lexical_index(self, store_name: str, vector_store) -> Optional[BM25Index]:
+        """
+        Get the BM25 index of a store, loading it from disk or building it from the stored texts.
+        """
+        if not self.lexical_index:
+            return None
+        with self._store_lock:
+            lexical_index = self._lexical_indexes.get(store_name)
+        if lexical_index is not None:
+            return lexical_index
+        
+        lexical_index = BM25Index.load(f"{self.persist_directory}/{store_name}")
+        if lexical_index is None:
+            # Stores written before the lexical index existed are indexed once from their texts
+            lexical_index = BM25Index()
+            if vector_store is not None:
+                ids, texts, metadatas = self._store_documents(vector_store)
+                lexical_index.add(ids, texts, [(metadata or {}).get("topic") for metadata in metadatas])
+                if not self.read_only:
+                    # Later writes only append to the log, which needs this snapshot as its base
+                    lexical_index.save(f"{self.persist_directory}/{store_name}")
+        with self._store_lock:
+            return self._lexical_indexes.setdefault(store_name, lexical_index)
     
-    def search_articles(self, query: str, topic: str, k: int = 5) -> List[Dict[str, Any]]:
+    def _store_documents(self, vector_store):
+        """
+        Read the IDs, texts and metadata of every document in a store.
+        """
+        if self.vector_store_type == "chroma":
+            data = vector_store.get(include=["documents", "metadatas"])
+            return data["ids"], data["documents"], data["metadatas"]
+        if self.vector_store_type == "numpy":
+            return list(vector_store.ids), list(vector_store.texts), list(vector_store.metadatas)
+        ids = list(vector_store.index_to_docstore_id.values())
+        docs = [vector_store.docstore.search(doc_id) for doc_id in ids]
+        return ids, [doc.page_content for doc in docs], [doc.metadata for doc in docs]
+    
+    def _documents_by_id(self, vector_store, ids: List[str]) -> Dict[str, Any]:
+        """
+        Look up stored documents as {ID: (content, metadata)}; unknown IDs are left out.
+        """
+        if self.vector_store_type == "chroma":
+            data = vector_store.get(ids=ids, include=["documents", "metadatas"])
+            return {doc_id: (content, metadata or {}) for doc_id, content, metadata in zip(
+                data["ids"], data["documents"], data["metadatas"]
+            )}
+        documents = {}
+        for doc_id in ids:
+            if self.vector_store_type == "numpy":
+                row = vector_store._rows.get(doc_id)
+                if row is not None:
+                    documents[doc_id] = (vector_store.texts[row], vector_store.metadatas[row])
+            else:
+                doc = vector_store.docstore.search(doc_id)
+                # InMemoryDocstore returns a message string for unknown IDs
+                if hasattr(doc, "metadata"):
+                    documents[doc_id] = (doc.page_content, doc.metadata)
+        return documents
+    
+    def _document_vectors(self, vector_store, ids: List[str], texts: List[str]) -> np.ndarray:
+        """
+        Stored embeddings of documents, in the order of ids.
+        """
+        if self.vector_store_type == "numpy":
+            return vector_store.get_embeddings(ids)
+        if self.vector_store_type == "chroma":
+            data = vector_store.get(ids=ids, include=["embeddings"])
+            by_id = dict(zip(data["ids"], data["embeddings"]))
+            missing = [text for doc_id, text in zip(ids, texts) if doc_id not in by_id]
+            if missing:
+                # Not stored under these IDs; embed the texts instead (served by the embedding cache)
+                by_text = dict(zip(missing, self.embedding_model.embed_documents(missing)))
+                return np.asarray([
+                    by_id[doc_id] if doc_id in by_id else by_text[text] for doc_id, text in zip(ids, texts)
+                ], dtype=np.float32)
+            return np.asarray([by_id[doc_id] for doc_id in ids], dtype=np.float32)
+        # FAISS indexes may be compressed; re-embed (served by the embedding cache)
+        return np.asarray(self.embedding_model.embed_documents(texts), dtype=np.float32)
+    
+    def search_articles(self,
+                        query: str,
+                        topic: Optional[str],
+                        k: int = 5,
+                        mmr: bool = False,
+                        fetch_k: int = 20,
+                        lambda_mult: float = 0.5) -> List[Dict[str, Any]]:
         """
         Search for articles by similarity to query.
+        
+        With unified=True, topic=None searches across all topics.
+        
+        Args:
+            query: Query to search for.
+            topic: Topic whose articles are searched.
+            k: Number of results.
+            mmr: Diversify the results with maximal marginal relevance, so the same story
+                syndicated by several outlets is returned once.
+            fetch_k: With mmr, number of nearest candidates the k results are chosen from.
+            lambda_mult: With mmr, 1 ranks by relevance only and 0 by diversity only.
+        """
+        try:
+            store_name, vector_store, topic_filter = self._search_target(topic)
+            if vector_store is None:
+                print(f"No stored articles found for topic: {topic}")
+                return []
+            
+            results = self._search_documents(store_name, vector_store, topic_filter, query, max(k, fetch_k) if mmr else k)
+            if mmr and len(results) > k:
+                results = self._diversify(vector_store, query, results, k, lambda_mult)
+            return [self._format_result(doc, score) for doc, score in results]
+        except Exception as e:
+            print(f"Error searching for articles: {e}")
+            return []
+    
+    def _search_documents(self,
+                          store_name: str,
+                          vector_store,
+                          topic_filter: Optional[Dict[str, str]],
+                          query: str,
+                          k: int) -> List[Any]:
+        """
+        Find the (document, score) pairs nearest to a query in a store, within the topic filter.
+        """
+        if topic_filter is None:
+            return vector_store.similarity_search_with_score(query, k=k)
+        if self.vector_store_type == "faiss":
+            query_vectors = np.asarray([self.embedding_model.embed_query(query)], dtype=np.float32)
+            return self._faiss_topic_search(store_name, vector_store, query_vectors, k, topic_filter["topic"])[0]
+        return vector_store.similarity_search_with_score(query, k=k, filter=topic_filter)
+    
+    def _result_id(self, doc: Document) -> str:
+        """
+        ID under which the store holds a returned document.
+        
+        Stores return it on the document; FAISS documents saved before LangChain kept IDs on
+        documents fall back to the ID this engine would have assigned.
+        """
+        return doc.id or self._document_id(doc.metadata, doc.page_content, doc.metadata.get("topic"))
+    
+    def _diversify(self, vector_store, query: str, results: List[Any], k: int, lambda_mult: float) -> List[Any]:
+        """
+        Pick k of the (document, score) candidates with maximal marginal relevance.
+        """
+        ids = [self._result_id(doc) for doc, _ in results]
+        vectors = self._document_vectors(vector_store, ids, [doc.page_content for doc, _ in results])
+        query_vector = np.asarray(self.embedding_model.embed_query(query), dtype=np.float32)
+        return [results[i] for i in maximal_marginal_relevance(query_vector, vectors, k=k, lambda_mult=lambda_mult)]
+    
+    def search_articles_batch(self, queries: List[str], topic: Optional[str], k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Search for articles for several queries at once.
+        
+        All queries are embedded in one model call and run as a single matrix search
+        against the topic's store.
+        
+        Args:
+            queries: Queries to search for.
+            topic: Topic whose articles are searched. With unified=True, None searches all topics.
+            k: Number of results per query.
+            
+        Returns:
+            One list of results per query, in the same format as search_articles.
         """
+        if not queries:
+            return []
         try:
-            topic = self._sanitize_topic(topic)
+            store_name, vector_store, topic_filter = self._search_target(topic)
+            if vector_store is None:
+                print(f"No stored articles found for topic: {topic}")
+                return [[] for _ in queries]
+            
+            query_vectors = np.asarray(self._embed_queries(queries), dtype=np.float32)
+            
             if self.vector_store_type == "chroma":
-                vector_store = Chroma(
-                    embedding_function=self.embedding_model,
-                    persist_directory=f"{self.persist_directory}/{topic}",
-                    collection_name=topic
+                results = vector_store._collection.query(
+                    query_embeddings=query_vectors.tolist(),
+                    n_results=k,
+                    where=topic_filter,
+                    include=["documents", "metadatas", "distances"]
                 )
-            elif self.vector_store_type == "faiss":
-                vector_store = FAISS.load_local(
-                    f"{self.persist_directory}/{topic}",
-                    self.embedding_model
+                batch_results = [
+                    [
+                        (Document(id=doc_id, page_content=content, metadata=metadata or {}), score)
+                        for doc_id, content, metadata, score in zip(row_ids, contents, metadatas, scores)
+                    ]
+                    for row_ids, contents, metadatas, scores in zip(
+                        results["ids"], results["documents"], results["metadatas"], results["distances"]
+                    )
+                ]
+            elif self.vector_store_type == "numpy":
+                # One matrix product for all queries
+                batch_results = vector_store.search_vectors(query_vectors, k=k, filter=topic_filter)
+            elif topic_filter is not None:
+                batch_results = self._faiss_topic_search(store_name, vector_store, query_vectors, k, topic_filter["topic"])
+            else:
+                # FAISS: one search call over the whole query matrix
+                batch_results = self._faiss_results(vector_store, *vector_store.index.search(query_vectors, k))
+            
+            return [[self._format_result(doc, score) for doc, score in row_results] for row_results in batch_results]
+        except Exception as e:
+            print(f"Error searching for articles: {e}")
+            return [[] for _ in queries]
+    
+    def _faiss_topic_search(self, store_name: str, vector_store, query_vectors: np.ndarray, k: int, topic: str):
+        """
+        Search a unified FAISS store within one topic's vectors only.
+        
+        Returns:
+            One list of (document, score) pairs per query.
+        """
+        labels = self._faiss_topic_labels_for(store_name, vector_store).get(topic)
+        if labels is None:
+            return [[] for _ in query_vectors]
+        return self._faiss_results(vector_store, *search_faiss_subset(vector_store.index, query_vectors, k, labels))
+    
+    def _faiss_topic_labels_for(self, store_name: str, vector_store) -> Dict[str, np.ndarray]:
+        """
+        FAISS labels of each topic's vectors in a unified store, read from the docstore once per write.
+        """
+        with self._store_lock:
+            cached = self._faiss_topic_labels.get(store_name)
+        if cached is not None and cached[0] is vector_store:
+            return cached[1]
+        by_topic: Dict[str, List[int]] = {}
+        for label, doc_id in vector_store.index_to_docstore_id.items():
+            by_topic.setdefault(vector_store.docstore.search(doc_id).metadata.get("topic"), []).append(label)
+        labels = {topic: np.asarray(topic_labels, dtype=np.int64) for topic, topic_labels in by_topic.items()}
+        with self._store_lock:
+            self._faiss_topic_labels[store_name] = (vector_store, labels)
+        return labels
+    
+    def _faiss_results(self, vector_store, scores: np.ndarray, indices: np.ndarray) -> List[List[Any]]:
+        """
+        Turn FAISS search output into one list of (document, score) pairs per query.
+        """
+        return [
+            [
+                (vector_store.docstore.search(vector_store.index_to_docstore_id[int(index)]), score)
+                for score, index in zip(row_scores, row_indices) if index != -1
+            ]
+            for row_scores, row_indices in zip(scores, indices)
+        ]
+    
+    def _format_result(self, doc: Document, score: Optional[float]) -> Dict[str, Any]:
+        """
+        Build a search result from a document and its distance to the query.
+        """
+        return {
+            "content": doc.page_content,
+            "metadata": doc.metadata,
+            "similarity_score": None if score is None else float(score)
+        }
+    
+    def hybrid_search_articles(self,
+                               query: str,
+                               topic: Optional[str],
+                               k: int = 5,
+                               fetch_k: int = 50,
+                               rrf_k: int = 60,
+                               prefilter: bool = False) -> List[Dict[str, Any]]:
+        """
+        Search for articles combining BM25 and vector similarity with reciprocal rank fusion.
+        
+        Exact terms such as company names or tickers are matched by the BM25 pass even when the
+        embedding model ranks them poorly.
+        
+        Args:
+            query: Query to search for.
+            topic: Topic whose articles are searched. With unified=True, None searches all topics.
+            k: Number of results.
+            fetch_k: Candidates taken from each ranking before fusion.
+            rrf_k: Reciprocal rank fusion constant.
+            prefilter: Rank only the BM25 candidates by vector similarity instead of searching the
+                whole store; falls back to a full vector search when no term matches.
+            
+        Returns:
+            Results in the format of search_articles, plus "bm25_score" and "fusion_score". The
+            similarity_score is None for articles found only by BM25.
+        """
+        try:
+            store_name, vector_store, topic_filter = self._search_target(topic)
+            if vector_store is None:
+                print(f"No stored articles found for topic: {topic}")
+                return []
+            lexical_index = self._get_lexical_index(store_name, vector_store)
+            if lexical_index is None:
+                raise ValueError("hybrid_search_articles requires lexical_index=True.")
+            
+            lexical = lexical_index.search(query, k=fetch_k, topic=topic_filter["topic"] if topic_filter else None)
+            bm25_scores = dict(lexical)
+            documents = {}
+            dense_scores = {}
+            
+            if prefilter and lexical:
+                documents = self._documents_by_id(vector_store, [doc_id for doc_id, _ in lexical])
+                candidate_ids = list(documents)
+                vectors = NumpyVectorStore._normalize(
+                    self._document_vectors(vector_store, candidate_ids, [documents[i][0] for i in candidate_ids])
                 )
+                query_vector = NumpyVectorStore._normalize(np.asarray(self.embedding_model.embed_query(query)))
+                similarities = vectors @ query_vector
+                for row in np.argsort(-similarities, kind="stable"):
+                    dense_scores[candidate_ids[row]] = float(2.0 - 2.0 * similarities[row])
             else:
-                raise ValueError(f"Unsupported vector store type: {self.vector_store_type}")
-                
-            results = vector_store.similarity_search_with_score(query, k=k)
+                for doc, score in self._search_documents(store_name, vector_store, topic_filter, query, fetch_k):
+                    doc_id = self._result_id(doc)
+                    documents[doc_id] = (doc.page_content, doc.metadata)
+                    dense_scores[doc_id] = float(score)
+            
+            fused = reciprocal_rank_fusion([list(dense_scores), list(bm25_scores)], k=rrf_k)[:k]
+            missing = [doc_id for doc_id, _ in fused if doc_id not in documents]
+            if missing:
+                documents.update(self._documents_by_id(vector_store, missing))
             return [
-                {
-                    "content": doc.page_content,
-                    "metadata": doc.metadata,
-                    "similarity_score": float(score)
-                } for doc, score in results
+                dict(
+                    self._format_result(
+                        Document(page_content=documents[doc_id][0], metadata=documents[doc_id][1]),
+                        dense_scores.get(doc_id)
+                    ),
+                    bm25_score=bm25_scores.get(doc_id),
+                    fusion_score=score
+                ) for doc_id, score in fused if doc_id in documents
             ]
         except Exception as e:
             print(f"Error searching for articles: {e}")
             return []
     
-    def _get_article_content(self, article: Dict[str, Any]) -> str:
+    def _search_target(self, topic: Optional[str]):
+        """
+        Resolve a search topic to its store name, store and the metadata filter selecting it.
+        """
+        if topic is None:
+            if not self.unified:
+                raise ValueError("Searching all topics requires unified=True.")
+            return UNIFIED_STORE, self._get_store(UNIFIED_STORE), None
+        topic = self._sanitize_topic(topic)
+        store_name = self._store_name(topic)
+        return store_name, self._get_store(store_name), self._topic_filter(topic)
+    
+    def topic_counts(self) -> Dict[str, int]:
+        """
+        Count the stored articles per topic.
+        
+        In the unified store this reads the "topic" metadata of one store; otherwise every
+        topic store under persist_directory is opened.
+        
+        Returns:
+            Sanitized topic names mapped to their number of articles.
+        """
+        if not self.unified:
+            counts = {}
+            if not os.path.isdir(self.persist_directory):
+                return counts
+            for name in sorted(os.listdir(self.persist_directory)):
+                if name.startswith("_") or not os.path.isdir(os.path.join(self.persist_directory, name)):
+                    continue
+                vector_store = self._get_store(name)
+                if vector_store is not None:
+                    counts[name] = self._store_size(vector_store)
+            return counts
+        
+        vector_store = self._get_store(UNIFIED_STORE)
+        if vector_store is None:
+            return {}
+        if self.vector_store_type == "chroma":
+            metadatas = vector_store.get(include=["metadatas"])["metadatas"]
+            topics = [(metadata or {}).get("topic") for metadata in metadatas]
+        elif self.vector_store_type == "numpy":
+            topics = [metadata.get("topic") for metadata in vector_store.metadatas]
+        else:
+            topics = [
+                vector_store.docstore.search(doc_id).metadata.get("topic")
+                for doc_id in vector_store.index_to_docstore_id.values()
+            ]
+        return dict(Counter(topic for topic in topics if topic is not None))
+    
+    def _store_size(self, vector_store) -> int:
+        """
+        Number of documents in a store.
+        """
+        if self.vector_store_type == "chroma":
+            return vector_store._collection.count()
+        if self.vector_store_type == "faiss":
+            return vector_store.index.ntotal
+        return len(vector_store)
+    
+    def delete_topic(self, topic: str) -> int:
+        """
+        Delete all stored articles of a topic.
+        
+        A per-topic store is dropped with its directory. In the unified store the topic's
+        documents are deleted by their "topic" metadata.
+        
+        Args:
+            topic: Topic to delete.
+            
+        Returns:
+            Number of articles deleted.
+        """
+        self._check_writable()
+        topic = self._sanitize_topic(topic)
+        store_name = self._store_name(topic)
+        vector_store = self._get_store(store_name)
+        if vector_store is None:
+            return 0
+        
+        if not self.unified:
+            deleted = self._store_size(vector_store)
+            if self.vector_store_type == "chroma":
+                vector_store.delete_collection()
+            self.invalidate_store(topic)
+            with self._store_lock:
+                self._lexical_indexes.pop(store_name, None)
+            if self.vector_store is vector_store:
+                self.vector_store = None
+            shutil.rmtree(f"{self.persist_directory}/{topic}", ignore_errors=True)
+            return deleted
+        
+        if self.vector_store_type == "chroma":
+            ids = vector_store.get(where={"topic": topic}, include=[])["ids"]
+            if ids:
+                vector_store._collection.delete(where={"topic": topic})
+                self._delete_lexical_topic(store_name, vector_store, topic)
+            return len(ids)
+        
+        if self.vector_store_type == "numpy":
+            ids = [doc_id for doc_id, metadata in zip(vector_store.ids, vector_store.metadatas)
+                   if metadata.get("topic") == topic]
+        else:
+            ids = [
+                doc_id for doc_id in vector_store.index_to_docstore_id.values()
+                if vector_store.docstore.search(doc_id).metadata.get("topic") == topic
+            ]
+        if not ids:
+            return 0
+        if self.vector_store_type == "faiss":
+            vector_store = self._remove_faiss_documents(vector_store, ids)
+            self._cache_store(store_name, vector_store)
+        else:
+            vector_store.delete(ids)
+        self._delete_lexical_topic(store_name, vector_store, topic)
+        self.vector_store = vector_store
+        self._persist_store(store_name)
+        return len(ids)
+    
+    def _delete_lexical_topic(self, store_name: str, vector_store, topic: str) -> None:
+        """
+        Remove a topic from the store's BM25 index and save it.
+        """
+        lexical_index = self._get_lexical_index(store_name, vector_store)
+        if lexical_index is not None:
+            lexical_index.delete_topic(topic)
+            lexical_index.save(f"{self.persist_directory}/{store_name}")
+    
+    def measure_quantization_recall(self, queries: List[str], topic: str, k: int = 10) -> Dict[str, float]:
+        """
+        Measure how well quantized search on a NumPy store matches an exact float32 search.
+        
+        Args:
+            queries: Sample queries.
+            topic: Topic whose store is measured.
+            k: Number of results per query.
+            
+        Returns:
+            recall@k with and without rescoring, and the bytes of the float32 and scanned vectors.
+        """
+        if self.vector_store_type != "numpy":
+            raise ValueError("measure_quantization_recall requires vector_store_type='numpy'.")
+        vector_store = self._get_store(self._store_name(self._sanitize_topic(topic)))
+        if vector_store is None or not queries:
+            return {"recall": 1.0, "recall_without_rescoring": 1.0, "float32_bytes": 0, "scanned_bytes": 0}
+        query_vectors = np.asarray(self._embed_queries(queries), dtype=np.float32)
+        return vector_store.measure_recall(query_vectors, k=k)
+    
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed several queries through the model's query path.
+        """
+        if hasattr(self.embedding_model, "embed_queries"):
+            return self.embedding_model.embed_queries(queries)
+        return embed_queries(self.embedding_model, queries)
+    
+    def _get_article_content(self, article: Union[Article, Dict[str, Any]]) -> str:
         """
         Extract content from article.
         """
+        if isinstance(article, Article):
+            # Formatted once and cached on the record
+            return article.text
+        
         title = article.get("title", "")
         description = article.get("description", "")
         content = article.get("content", "")
@@ -0,0 +1,294 @@
+"""
+Module for building and loading FAISS indexes.
+"""
+import os
+import re
+import pickle
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_community.docstore.base import Docstore
+
+FLAT_SPEC = "Flat"
+
+# Scalar-quantized flat indexes used for float16 / int8 vector storage
+FAISS_QUANTIZED_SPECS = {"float16": "SQfp16", "int8": "SQ8"}
+
+def normalize_index_spec(spec: Optional[str]) -> str:
+    """
+    Turn a short index spec into a FAISS index_factory string.
+
+    Supported forms are "Flat", "IVF<nlist>", "HNSW<M>" and "IVF<nlist>,PQ<m>";
+    any other string is passed to faiss.index_factory unchanged.
+
+    Args:
+        spec: Index spec, case-insensitive for the short forms.
+
+    Returns:
+        The index_factory string.
+    """
+    if not spec:
+        return FLAT_SPEC
+    spec = spec.replace(" ", "")
+    if spec.lower() == "flat":
+        return FLAT_SPEC
+    match = re.fullmatch(r"(?i)ivf(\d+)", spec)
+    if match:
+        return f"IVF{match.group(1)},Flat"
+    match = re.fullmatch(r"(?i)hnsw(\d+)", spec)
+    if match:
+        return f"HNSW{match.group(1)}"
+    match = re.fullmatch(r"(?i)ivf(\d+),pq(\d+)", spec)
+    if match:
+        return f"IVF{match.group(1)},PQ{match.group(2)}"
+    return spec
+
+def is_flat_index(index) -> bool:
+    """
+    Check whether a FAISS index does exact (flat) search.
+    """
+    import faiss
+    return isinstance(faiss.downcast_index(index), faiss.IndexFlat)
+
+def has_stable_labels(index) -> bool:
+    """
+    Check whether vectors of a FAISS index are added with add_with_ids and removed in place
+    without renumbering the others: IVF indexes store labels natively, code-array indexes
+    through an IndexIDMap2.
+    """
+    import faiss
+    return isinstance(faiss.downcast_index(index), (faiss.IndexIVF, faiss.IndexIDMap))
+
+def build_faiss_index(vectors: np.ndarray,
+                      spec: str = FLAT_SPEC,
+                      train_sample_size: int = 50000,
+                      search_params: Optional[Dict[str, Any]] = None,
+                      seed: int = 0):
+    """
+    Build an empty FAISS index for the spec, trained on a sample of vectors if needed.
+
+    Falls back to an exact flat index when there are too few vectors to train the spec.
+    Code-array indexes (SQ, PQ) are wrapped in an IndexIDMap2, because their remove_ids
+    renumbers the remaining vectors; IVF indexes keep labels themselves. Either way single
+    vectors can be replaced in place. Graph indexes such as HNSW cannot remove vectors.
+
+    Args:
+        vectors: Embedding matrix used for training.
+        spec: Index spec (see normalize_index_spec).
+        train_sample_size: Maximum number of vectors used for training.
+        search_params: Search-time parameters such as nprobe or efSearch.
+        seed: Seed for sampling the training vectors.
+
+    Returns:
+        The FAISS index. Vectors are not added.
+    """
+    import faiss
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    dim = vectors.shape[1]
+    factory_spec = normalize_index_spec(spec)
+    if factory_spec == FLAT_SPEC:
+        return faiss.IndexFlatL2(dim)
+
+    index = faiss.index_factory(dim, factory_spec)
+    if not index.is_trained:
+        sample = vectors
+        if len(vectors) > train_sample_size:
+            rows = np.random.default_rng(seed).choice(len(vectors), train_sample_size, replace=False)
+            sample = vectors[rows]
+        try:
+            index.train(sample)
+        except RuntimeError as e:
+            # IVF needs at least nlist vectors and PQ at least 2^nbits per code book
+            print(f"Warning: Not enough vectors to train FAISS index '{factory_spec}' ({len(sample)} given), "
+                  f"using a flat index instead: {e}")
+            return faiss.IndexFlatL2(dim)
+
+    if isinstance(faiss.downcast_index(index), faiss.IndexFlatCodes):
+        index = faiss.IndexIDMap2(index)
+    apply_search_params(index, search_params)
+    return index
+
+def apply_search_params(index, search_params: Optional[Dict[str, Any]]) -> None:
+    """
+    Set search-time parameters (e.g. nprobe for IVF, efSearch for HNSW) on an index.
+
+    Args:
+        index: FAISS index.
+        search_params: Parameter names mapped to values. Parameters the index does not have are skipped.
+    """
+    if not search_params:
+        return
+    import faiss
+
+    parameter_space = faiss.ParameterSpace()
+    for name, value in search_params.items():
+        try:
+            parameter_space.set_index_parameter(index, name, value)
+        except RuntimeError:
+            # e.g. efSearch on an IVF index
+            continue
+
+def search_faiss_subset(index, queries: np.ndarray, k: int, labels: np.ndarray):
+    """
+    Search only the vectors with the given labels, considering every one of them.
+
+    The labels are passed to FAISS as an ID selector, so filtering happens before
+    ranking. IVF indexes probe all lists, and HNSW indexes scan their stored vectors
+    because a filtered graph walk can miss matches when few vectors are selected.
+
+    Args:
+        index: FAISS index.
+        queries: Query matrix, one row per query.
+        k: Number of results per query.
+        labels: Labels (as returned by index.search) of the vectors to search.
+
+    Returns:
+        (distances, labels) arrays as returned by index.search; missing results are -1.
+    """
+    import faiss
+
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    selector = faiss.IDSelectorBatch(np.ascontiguousarray(labels, dtype=np.int64))
+    target = faiss.downcast_index(index)
+    if isinstance(target, faiss.IndexHNSW):
+        # HNSW labels are positions in its flat storage
+        target = faiss.downcast_index(target.storage)
+    ivf = faiss.try_extract_index_ivf(target)
+    if ivf is not None:
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nlist)
+    else:
+        params = faiss.SearchParameters(sel=selector)
+    return target.search(queries, k, params=params)
+
+def _is_ivf_file(path: str) -> bool:
+    """
+    Check from the four-character type code at the start of an index file whether it holds an IVF index.
+    """
+    with open(path, "rb") as f:
+        fourcc = f.read(4)
+    # IVF type codes are "Iw.." ("Iv.." in files written by old FAISS versions)
+    return fourcc[:2] in (b"Iw", b"Iv")
+
+def read_faiss_index(path: str, mmap: bool = True):
+    """
+    Read a FAISS index from disk, memory-mapping it read-only when possible.
+
+    With mmap the index data stays in the page cache, so worker processes serving the
+    same index share one copy instead of each holding its own. IVF indexes map their
+    inverted lists (IO_FLAG_MMAP); flat and scalar-quantized indexes, and the vector
+    storage of HNSW indexes, map their codes (IO_FLAG_MMAP_IFC, FAISS 1.10+). Anything
+    else is read into memory with a warning.
+
+    Args:
+        path: Path to the index file.
+        mmap: Whether to memory-map the index instead of reading it into RAM.
+
+    Returns:
+        The FAISS index.
+    """
+    import faiss
+
+    if not mmap:
+        return faiss.read_index(path)
+    ivf = _is_ivf_file(path)
+    if ivf:
+        flags = faiss.IO_FLAG_MMAP
+    elif hasattr(faiss, "IO_FLAG_MMAP_IFC"):
+        flags = faiss.IO_FLAG_MMAP_IFC
+    else:
+        print(f"Warning: This FAISS version cannot memory-map non-IVF index {path}, loading it into memory.")
+        return faiss.read_index(path)
+    try:
+        index = faiss.read_index(path, flags | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError as e:
+        # Not every index type can be memory-mapped
+        print(f"Warning: Cannot memory-map FAISS index {path}, loading it into memory: {e}")
+        return faiss.read_index(path)
+    if not ivf:
+        downcast_index = faiss.downcast_index(index)
+        # HNSW keeps its vectors in .storage, ID maps wrap their index in .index
+        storage = getattr(downcast_index, "storage", None) or getattr(downcast_index, "index", None)
+        if not isinstance(downcast_index, faiss.IndexFlatCodes) and not (
+                storage is not None and isinstance(faiss.downcast_index(storage), faiss.IndexFlatCodes)):
+            print(f"Warning: FAISS index {path} ({type(downcast_index).__name__}) cannot be memory-mapped "
+                  f"and was loaded into memory.")
+    return index
+
+class _LazyPickle:
+    """
+    The (docstore, index_to_docstore_id) pair saved by FAISS.save_local, unpickled on first use.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._value = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    with open(self.path, "rb") as f:
+                        self._value = pickle.load(f)
+        return self._value
+
+class LazyDocstore(Docstore):
+    """
+    Read-only docstore that loads the saved documents only when a search needs them.
+    """
+    def __init__(self, source: _LazyPickle):
+        self._source = source
+
+    def search(self, search: str) -> Union[str, Document]:
+        return self._source.load()[0].search(search)
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        raise ValueError("This docstore is read-only.")
+
+    def delete(self, ids) -> None:
+        raise ValueError("This docstore is read-only.")
+
+class LazyIndexMapping(Mapping):
+    """
+    Read-only index-position-to-document-ID mapping loaded only when first accessed.
+    """
+    def __init__(self, source: _LazyPickle):
+        self._source = source
+
+    def __getitem__(self, key: int) -> str:
+        return self._source.load()[1][key]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._source.load()[1])
+
+    def __len__(self) -> int:
+        return len(self._source.load()[1])
+
+def load_faiss_serving(folder_path: str, embedding_function, mmap: bool = True):
+    """
+    Load a FAISS store saved with save_local for read-only serving.
+
+    The index is memory-mapped and the docstore metadata is unpickled lazily on the
+    first search that needs it.
+
+    Args:
+        folder_path: Folder passed to save_local.
+        embedding_function: Embedding model used for queries.
+        mmap: Whether to memory-map the index.
+
+    Returns:
+        A read-only langchain FAISS store.
+    """
+    from langchain_community.vectorstores import FAISS
+
+    index = read_faiss_index(os.path.join(folder_path, "index.faiss"), mmap=mmap)
+    source = _LazyPickle(os.path.join(folder_path, "index.pkl"))
+    return FAISS(
+        embedding_function=embedding_function,
+        index=index,
+        docstore=LazyDocstore(source),
+        index_to_docstore_id=LazyIndexMapping(source)
+    )
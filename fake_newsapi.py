@@ -0,0 +1,291 @@
+"""
+Module providing a local stand-in for the NewsAPI /v2/everything endpoint.
+
+Run it with `python fake_newsapi.py --port 8765` and point the application at it with
+NEWSAPI_BASE_URL=http://127.0.0.1:8765/v2/everything to benchmark or soak-test the
+pipeline without spending real quota or needing network access.
+"""
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_FIXTURES_FILE = "fixtures/newsapi_everything.json"
+
+SOURCES = ["Wired", "The Verge", "Reuters", "Associated Press", "BBC News", "Ars Technica"]
+
+class FakeNewsAPI:
+    """
+    Class for serving recorded or synthetic NewsAPI responses from a local HTTP server.
+    """
+    def __init__(self,
+                host: str = "127.0.0.1",
+                port: int = 0,
+                fixtures_file: Optional[str] = None,
+                latency: float = 0.0,
+                latency_jitter: float = 0.0,
+                error_rate: float = 0.0,
+                rate_limit_rate: float = 0.0,
+                retry_after: Optional[int] = 1,
+                total_results: int = 300,
+                api_key: Optional[str] = None,
+                seed: Optional[int] = None):
+        """
+        Initialize the FakeNewsAPI.
+
+        Args:
+            host: Interface to bind.
+            port: Port to bind. 0 picks a free port.
+            fixtures_file: JSON file mapping lowercased queries to recorded raw articles.
+                Queries without fixtures get synthetic articles.
+            latency: Seconds added to every response.
+            latency_jitter: Maximum extra random seconds added to every response.
+            error_rate: Fraction of requests answered with HTTP 500.
+            rate_limit_rate: Fraction of requests answered with HTTP 429.
+            retry_after: Retry-After seconds sent with 429 responses. If None, the header is omitted.
+            total_results: Number of synthetic articles available per query.
+            api_key: If set, requests with a different apiKey get HTTP 401.
+            seed: Seed for the random latency and fault injection.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.total_results = total_results
+        self.api_key = api_key
+        self.fixtures = self._load_fixtures(fixtures_file) if fixtures_file else {}
+
+        self.requests_served = 0
+        self.errors_injected = 0
+        self.rate_limits_injected = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _load_fixtures(self, fixtures_file: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load recorded articles keyed by lowercased query.
+        """
+        with open(fixtures_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return {" ".join(query.split()).lower(): articles for query, articles in data.items()}
+
+    @property
+    def url(self) -> str:
+        """
+        URL of the /v2/everything endpoint, usable as NewsRetriever base_url.
+        """
+        host, port = self._server.server_address[:2] if self._server else (self.host, self.port)
+        return f"http://{host}:{port}/v2/everything"
+
+    def _synthetic_article(self, query: str, index: int) -> Dict[str, Any]:
+        """
+        Build a deterministic raw article for a query and result index.
+        """
+        digest = hashlib.sha1(f"{query}:{index}".encode("utf-8")).hexdigest()
+        source = SOURCES[int(digest[:2], 16) % len(SOURCES)]
+        published = datetime(2025, 3, 15, tzinfo=timezone.utc) - timedelta(minutes=7 * index)
+        return {
+            "source": {"id": None, "name": source},
+            "author": f"Reporter {digest[2:6]}",
+            "title": f"{query.title()} update #{index + 1}: developments reported by {source}",
+            "description": f"Synthetic coverage of {query} ({digest[:8]}) for offline testing.",
+            "url": f"https://example.com/{query.replace(' ', '-')}/{index + 1}-{digest[:8]}",
+            "urlToImage": None,
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": (
+                f"This is synthetic article {index + 1} about {query}. "
+                f"It exists so the pipeline can be exercised without the real API. [+{200 + index} chars]"
+            )
+        }
+
+    def search(self, query: str, page: int, page_size: int) -> Dict[str, Any]:
+        """
+        Build a /v2/everything response body for a query page.
+
+        Args:
+            query: Search query.
+            page: 1-based page number.
+            page_size: Articles per page.
+
+        Returns:
+            Response body in NewsAPI format.
+        """
+        key = " ".join(query.split()).lower()
+        start = (page - 1) * page_size
+        if key in self.fixtures:
+            recorded = self.fixtures[key]
+            total = len(recorded)
+            articles = recorded[start:start + page_size]
+        else:
+            total = self.total_results
+            articles = [self._synthetic_article(key, i) for i in range(start, min(start + page_size, total))]
+        return {"status": "ok", "totalResults": total, "articles": articles}
+
+    def _roll(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0
+        return self.latency + jitter
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                # Keep load tests quiet
+                pass
+
+            def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                with api._lock:
+                    api.requests_served += 1
+
+                parsed = urlparse(self.path)
+                params = {name: values[0] for name, values in parse_qs(parsed.query).items()}
+
+                delay = api._delay()
+                if delay:
+                    time.sleep(delay)
+
+                if parsed.path.rstrip("/") != "/v2/everything":
+                    self._send_json(404, {"status": "error", "code": "notFound", "message": "Unknown endpoint."})
+                    return
+
+                if api.api_key is not None and params.get("apiKey") != api.api_key:
+                    self._send_json(401, {"status": "error", "code": "apiKeyInvalid", "message": "Your API key is invalid."})
+                    return
+
+                if api._roll(api.rate_limit_rate):
+                    with api._lock:
+                        api.rate_limits_injected += 1
+                    headers = {"Retry-After": str(api.retry_after)} if api.retry_after is not None else None
+                    self._send_json(429, {
+                        "status": "error",
+                        "code": "rateLimited",
+                        "message": "You have made too many requests recently."
+                    }, headers)
+                    return
+
+                if api._roll(api.error_rate):
+                    with api._lock:
+                        api.errors_injected += 1
+                    self._send_json(500, {"status": "error", "code": "unexpectedError", "message": "Injected failure."})
+                    return
+
+                query = params.get("q", "")
+                if not query:
+                    self._send_json(400, {"status": "error", "code": "parametersMissing", "message": "Required parameter q is missing."})
+                    return
+
+                try:
+                    page = max(1, int(params.get("page", 1)))
+                    page_size = max(1, min(100, int(params.get("pageSize", 100))))
+                except ValueError:
+                    self._send_json(400, {"status": "error", "code": "parameterInvalid", "message": "Invalid page or pageSize."})
+                    return
+
+                self._send_json(200, api.search(query, page, page_size))
+
+        return Handler
+
+    def start(self) -> "FakeNewsAPI":
+        """
+        Start serving on a background thread.
+
+        Returns:
+            The running FakeNewsAPI.
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the server and release the port.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        """
+        Serve on the current thread until interrupted.
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> "FakeNewsAPI":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+def main():
+    """Run the fake NewsAPI from the command line."""
+    parser = argparse.ArgumentParser(description="Local stand-in for the NewsAPI /v2/everything endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_FILE, help="Recorded responses (JSON); use '' for synthetic only.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum extra random latency in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 429.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds for injected 429s; negative omits the header.")
+    parser.add_argument("--total-results", type=int, default=300, help="Synthetic articles available per query.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    api = FakeNewsAPI(
+        host=args.host,
+        port=args.port,
+        fixtures_file=args.fixtures or None,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after if args.retry_after >= 0 else None,
+        total_results=args.total_results,
+        seed=args.seed
+    )
+    print(f"Fake NewsAPI listening on {api.url}")
+    print(f"Use it with: NEWSAPI_BASE_URL={api.url}")
+    try:
+        api.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Module for managing pooled HTTP sessions.
+"""
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+class PooledSession:
+    """
+    Class owning a pooled requests.Session with keep-alive, compression and timeouts.
+    """
+    def __init__(self,
+                pool_connections: int = 10,
+                pool_maxsize: int = 10,
+                connect_timeout: float = 5.0,
+                read_timeout: float = 30.0,
+                keep_alive: bool = True,
+                compress: bool = True,
+                headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the PooledSession.
+
+        Args:
+            pool_connections: Number of host pools to cache.
+            pool_maxsize: Maximum number of connections kept open per host.
+            connect_timeout: Seconds to wait for a connection to be established.
+            read_timeout: Seconds to wait for the server to send data.
+            keep_alive: Whether to keep connections open between requests.
+            compress: Whether to negotiate gzip/deflate compressed responses.
+            headers: Extra headers sent with every request.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self.keep_alive = keep_alive
+        self.compress = compress
+        self.headers = dict(headers or {})
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _build_session(self) -> requests.Session:
+        """
+        Create the underlying requests.Session with a sized connection pool.
+        """
+        session = requests.Session()
+
+        # Retries are handled by the callers, so the adapter never retries on its own
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=0
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        session.headers["Connection"] = "keep-alive" if self.keep_alive else "close"
+        session.headers["Accept-Encoding"] = "gzip, deflate" if self.compress else "identity"
+        session.headers.update(self.headers)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Underlying requests.Session, created on first use.
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def get(self,
+            url: str,
+            params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[Union[float, Tuple[float, float]]] = None,
+            **kwargs) -> requests.Response:
+        """
+        Send a GET request through the pooled session.
+
+        Args:
+            url: URL to request.
+            params: Query string parameters.
+            timeout: Per-request timeout overriding the session default.
+
+        Returns:
+            The HTTP response.
+        """
+        return self.session.get(url, params=params, timeout=timeout or self.timeout, **kwargs)
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self) -> "PooledSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,18 +1,27 @@
 """
 Main application interface for the news summarization application.
 """
+import time
+
+# Taken before the remaining imports; the fallback start time where the process start
+# time is unavailable, which misses interpreter startup
+STARTED_AT = time.perf_counter()
+
 import os
 import sys
-import time
 import argparse
 from typing import Dict, List, Any
 from dotenv import load_dotenv
 
-from news_retriever import NewsRetriever
-from embedding_engine import EmbeddingEngine
-from summarizer import ArticleSummarizer
+from pipeline import NewsPipeline
 from user_manager import UserManager
 
+# Modules that should only be imported by the first search, not before the prompt
+HEAVY_MODULES = (
+    "langchain", "langchain_huggingface", "langchain_chroma", "langchain_community",
+    "transformers", "torch", "sentence_transformers", "faiss", "chromadb"
+)
+
 def display_welcome():
     """Display welcome message and instructions."""
     print("\n" + "=" * 80)
@@ -56,13 +65,14 @@ def setup_environment():
         print('HUGGINGFACEHUB_API_TOKEN="your_huggingface_token_here"')
         sys.exit(1)
 
-def search_and_summarize(topic: str, user_manager: UserManager):
+def search_and_summarize(topic: str, user_manager: UserManager, pipeline: NewsPipeline):
     """
     Search for news on a topic and create a summary.
     
     Args:
         topic: Topic to search for.
         user_manager: UserManager instance.
+        pipeline: Shared NewsPipeline holding the retriever, embedding engine and summarizer.
     """
     try:
         # Get user preferences
@@ -72,12 +82,9 @@ def search_and_summarize(topic: str, user_manager: UserManager):
         print(f"\nSearching for news on: {topic}")
         print(f"Summary type: {summary_type}")
         
-        # Initialize the NewsRetriever
-        news_retriever = NewsRetriever()
-        
         # Retrieve articles
         print("Retrieving articles...")
-        articles = news_retriever.get_articles(topic)
+        articles = pipeline.news_retriever.get_articles(topic)
         
         if not articles:
             print("No articles found for this topic.")
@@ -85,15 +92,20 @@ def search_and_summarize(topic: str, user_manager: UserManager):
         
         print(f"Found {len(articles)} articles.")
         
-        # Initialize the EmbeddingEngine
-        embedding_engine = EmbeddingEngine(vector_store_type="chroma")
+        # Collapse syndicated copies within the results before they cost summarizer tokens
+        unique_articles = pipeline.deduplicator.dedupe(articles)
+        if len(unique_articles) < len(articles):
+            print(f"Removed {len(articles) - len(unique_articles)} duplicate articles.")
+        articles = unique_articles
         
-        # Create embeddings
-        print("Creating embeddings...")
-        embedding_engine.create_embeddings(articles, topic)
+        # Only embed articles that are not copies of ones already stored under the topic
+        new_articles = pipeline.deduplicator.dedupe(articles, topic)
+        if new_articles:
+            print("Creating embeddings...")
+            pipeline.embedding_engine.create_embeddings(new_articles, topic)
         
-        # Initialize the ArticleSummarizer
-        summarizer = ArticleSummarizer()
+        # Reuse the shared ArticleSummarizer
+        summarizer = pipeline.summarizer
         
         # Create summary based on user preference
         print("Generating summary...")
@@ -123,17 +135,82 @@ def search_and_summarize(topic: str, user_manager: UserManager):
     except Exception as e:
         print(f"Error: {e}")
 
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Retrieve and summarize news on topics of interest.")
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Report the time from process start until the prompt appears and warn if it exceeds SECONDS. "
+             "Where the process start time is unavailable (non-Linux), interpreter startup is not counted."
+    )
+    parser.add_argument(
+        "--check-startup",
+        action="store_true",
+        help="Exit once the prompt would appear; the exit code is 1 if the startup budget was exceeded."
+    )
+    return parser.parse_args(argv)
+
+def startup_elapsed() -> float:
+    """
+    Seconds since the process started, including interpreter startup.
+    
+    Read from /proc on Linux (10 ms resolution); elsewhere measured from STARTED_AT,
+    which is taken after the interpreter has started.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesized command name; starttime is field 22 of the line
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter() - STARTED_AT
+
+def report_startup(budget: float) -> bool:
+    """
+    Print the time from process start to the prompt and any heavy modules already imported.
+    
+    Args:
+        budget: Allowed startup time in seconds.
+        
+    Returns:
+        True if startup stayed within the budget.
+    """
+    elapsed = startup_elapsed()
+    print(f"Startup: {elapsed:.3f}s to prompt (budget {budget:.3f}s)")
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    if loaded:
+        print(f"Warning: Imported before the prompt: {', '.join(loaded)}")
+    if elapsed > budget:
+        print(f"Warning: Startup exceeded its budget by {elapsed - budget:.3f}s")
+        return False
+    return True
+
 def main():
     """Main application function."""
+    cli_args = parse_args()
+    
     # Setup environment
     setup_environment()
     
     # Initialize user manager
     user_manager = UserManager()
     
+    # Initialize the shared pipeline once; components are reused across searches
+    pipeline = NewsPipeline(vector_store_type="chroma")
+    
     # Display welcome message
     display_welcome()
     
+    if cli_args.startup_budget is not None or cli_args.check_startup:
+        within_budget = report_startup(cli_args.startup_budget if cli_args.startup_budget is not None else float("inf"))
+        if cli_args.check_startup:
+            sys.exit(0 if within_budget else 1)
+    
     # Main application loop
     while True:
         try:
@@ -158,7 +235,7 @@ def main():
                     print("Please specify a topic to search for.")
                     continue
                 
-                search_and_summarize(args, user_manager)
+                search_and_summarize(args, user_manager, pipeline)
             
             elif command == "save":
                 if not args:
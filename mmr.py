@@ -0,0 +1,53 @@
+"""
+Module for diversifying search results with maximal marginal relevance.
+"""
+from typing import List
+
+import numpy as np
+
+def maximal_marginal_relevance(query_vector: np.ndarray,
+                               candidate_vectors: np.ndarray,
+                               k: int = 5,
+                               lambda_mult: float = 0.5) -> List[int]:
+    """
+    Select k diverse candidates with maximal marginal relevance.
+
+    Each step picks the candidate maximizing
+    lambda_mult * sim(query, c) - (1 - lambda_mult) * max(sim(c, selected)).
+    All pairwise similarities come from one matrix product; each step only updates the
+    running maximum similarity to the selected set.
+
+    Args:
+        query_vector: Query embedding.
+        candidate_vectors: Candidate embedding matrix, one row per candidate.
+        k: Number of candidates to select.
+        lambda_mult: 1 ranks by relevance only, 0 by diversity only.
+
+    Returns:
+        Indices of the selected candidates, in selection order.
+    """
+    vectors = np.asarray(candidate_vectors, dtype=np.float32)
+    if vectors.ndim != 2 or len(vectors) == 0 or k <= 0:
+        return []
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms
+    query = np.asarray(query_vector, dtype=np.float32)
+    query = query / (np.linalg.norm(query) or 1.0)
+
+    relevance = vectors @ query
+    similarity = vectors @ vectors.T
+
+    first = int(np.argmax(relevance))
+    selected = [first]
+    available = np.ones(len(vectors), dtype=bool)
+    available[first] = False
+    max_similarity = similarity[first].copy()
+    for _ in range(min(k, len(vectors)) - 1):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
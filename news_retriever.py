@@ -2,36 +2,103 @@
 Module for retrieving news articles from NewsAPI.
 """
 import os
-import requests
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Union
 import time
-from tenacity import retry, stop_after_attempt, wait_exponential
+from concurrent.futures import ThreadPoolExecutor
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from article import Article
+from http_session import PooledSession
+from response_cache import ResponseCache, make_request_key
+from singleflight import SingleFlight
+from watermark_store import WatermarkStore
+from rate_limiter import RateLimiter, RateLimitError, QuotaExceededError, get_shared_rate_limiter, parse_retry_after
+
+# Longest Retry-After the retry loop will sleep through before giving up
+MAX_RETRY_AFTER_SECONDS = 60
+
+class RequestRejectedError(Exception):
+    """
+    Raised when NewsAPI rejects a request with a 4xx status other than 408 or 429
+    (e.g. apiKeyInvalid, parameterInvalid, maximumResultsReached); sending it again
+    gives the same answer.
+    """
+    def __init__(self, message: str, status_code: int, code: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+def _should_retry(exception: BaseException) -> bool:
+    """
+    Retry transient failures, but never a used-up quota, a rejected request or a 429 without Retry-After.
+    """
+    if isinstance(exception, (QuotaExceededError, RequestRejectedError)):
+        return False
+    if isinstance(exception, RateLimitError):
+        return exception.retry_after is not None and exception.retry_after <= MAX_RETRY_AFTER_SECONDS
+    return True
+
+_exponential_wait = wait_exponential(multiplier=1, min=2, max=10)
+
+def _wait_for_retry(retry_state) -> float:
+    """
+    Wait as long as the server's Retry-After asks, otherwise back off exponentially.
+    """
+    exception = retry_state.outcome.exception()
+    if isinstance(exception, RateLimitError) and exception.retry_after is not None:
+        return exception.retry_after
+    return _exponential_wait(retry_state)
 
 class NewsRetriever:
     """
     Class for retrieving news articles from NewsAPI.
     """
     BASE_URL = "https://newsapi.org/v2/everything"
+    MAX_PAGE_SIZE = 100
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self,
+                api_key: Optional[str] = None,
+                session: Optional[PooledSession] = None,
+                cache: Optional[ResponseCache] = None,
+                watermarks: Optional[WatermarkStore] = None,
+                rate_limiter: Optional[RateLimiter] = None,
+                base_url: Optional[str] = None):
         """
         Initialize the NewsRetriever with the NewsAPI key.
         
         Args:
             api_key: NewsAPI key. If None, will look for NEWSAPI_KEY environment variable.
+            session: Pooled HTTP session to send requests through. If None, a default one is created.
+            cache: Response cache for repeated queries. If None, every query goes to the API.
+            watermarks: Store of the newest article seen per topic. If None, watermarks are kept in memory.
+            rate_limiter: Rate limiter and quota tracker. If None, the process-wide shared one is used.
+            base_url: Endpoint to query. If None, uses NEWSAPI_BASE_URL or the public NewsAPI endpoint.
         """
         self.api_key = api_key or os.environ.get("NEWSAPI_KEY")
         if not self.api_key:
             raise ValueError("NewsAPI key is required. Please provide it or set NEWSAPI_KEY environment variable.")
+        
+        # Point at a local stand-in (see fake_newsapi.py) for load tests and offline runs
+        self.base_url = base_url or os.environ.get("NEWSAPI_BASE_URL") or self.BASE_URL
+        
+        # Reuse connections (keep-alive) across requests instead of a new handshake per query
+        self.session = session or PooledSession()
+        self.cache = cache
+        self.watermarks = watermarks or WatermarkStore(storage_file=None)
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        
+        # Concurrent identical queries share one upstream request
+        self._inflight = SingleFlight()
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def get_articles(self, 
                     topic: str, 
                     days_back: int = 7, 
                     language: str = "en", 
                     sort_by: str = "relevancy",
-                    page_size: int = 10) -> List[Dict[str, Any]]:
+                    page_size: int = 10,
+                    timeout: Optional[float] = None,
+                    incremental: bool = False) -> List[Article]:
         """
         Retrieve news articles for a specific topic with retry capability.
         
@@ -41,9 +108,140 @@ class NewsRetriever:
             language: Language of articles (default: English).
             sort_by: Sort order (relevancy, popularity, publishedAt).
             page_size: Number of articles to return.
+            timeout: Request timeout in seconds. If None, the session default is used.
+            incremental: If True, return every article newer than the last incremental fetch of this
+                topic. Pages are fetched newest first (sort_by and page_size are ignored) until the
+                topic's watermark is reached, and only then is the watermark moved forward.
             
         Returns:
-            List of article dictionaries.
+            List of articles.
+        """
+        if incremental:
+            return self._get_new_articles(topic, days_back, language, timeout)
+        
+        params = self._build_params(topic, days_back, language, sort_by, page_size)
+        
+        # Make the API request (served from the cache when possible)
+        data = self._request(params, timeout=timeout)
+        
+        # Process the articles to include only the relevant information
+        return self._process_articles(data.get("articles", []))
+
+    def _get_new_articles(self,
+                          topic: str,
+                          days_back: int,
+                          language: str,
+                          timeout: Optional[float] = None) -> List[Article]:
+        """
+        Fetch the articles published since the topic's watermark and advance the watermark.
+        """
+        watermark = self.watermarks.get(topic)
+        params = self._build_params(topic, days_back, language, "publishedAt", self.MAX_PAGE_SIZE)
+        # Narrow the window to articles published after the watermark
+        if watermark and watermark > params["from"]:
+            params["from"] = watermark[:19]
+        
+        articles = []
+        seen = 0
+        page = 1
+        reached_watermark = False
+        while True:
+            try:
+                data = self._request(dict(params, page=page), timeout=timeout)
+            except Exception as e:
+                # Later pages can fail (e.g. the plan's result limit); keep what was already fetched
+                if page == 1:
+                    raise
+                print(f"Warning: stopped paging '{topic}' at page {page}: {e}")
+                break
+            
+            raw_articles = data.get("articles", [])
+            page_articles = self._process_articles(raw_articles)
+            # "from" is inclusive, so drop the articles that were already seen
+            new_articles = [a for a in page_articles if (a.get("published_at") or "") > (watermark or "")]
+            articles.extend(new_articles)
+            
+            seen += len(raw_articles)
+            if (len(new_articles) < len(page_articles) or len(raw_articles) < self.MAX_PAGE_SIZE
+                    or seen >= data.get("totalResults", 0)):
+                reached_watermark = True
+                break
+            page += 1
+        
+        # Moving the watermark past a gap that was not fetched would skip those articles for
+        # good; the first fetch of a topic has no gap to lose and sets the starting point
+        if reached_watermark or watermark is None:
+            newest = max((a.get("published_at") or "" for a in articles), default=None)
+            self.watermarks.update(topic, newest)
+        
+        return articles
+
+    def iter_articles(self,
+                      topic: str,
+                      days_back: int = 7,
+                      language: str = "en",
+                      sort_by: str = "relevancy",
+                      page_size: int = 100,
+                      max_articles: Optional[int] = None,
+                      time_budget: Optional[float] = None,
+                      timeout: Optional[float] = None) -> Iterator[Article]:
+        """
+        Lazily walk the result pages for a topic, yielding articles as each page arrives.
+        
+        Args:
+            topic: The topic to search for.
+            days_back: Number of days to look back for articles.
+            language: Language of articles (default: English).
+            sort_by: Sort order (relevancy, popularity, publishedAt).
+            page_size: Number of articles requested per page (NewsAPI allows at most 100).
+            max_articles: Stop after yielding this many articles. If None, no article budget.
+            time_budget: Stop requesting new pages after this many seconds. If None, no time budget.
+            timeout: Request timeout in seconds. If None, the session default is used.
+            
+        Yields:
+            Articles.
+        """
+        page_size = max(1, min(page_size, self.MAX_PAGE_SIZE))
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        yielded = 0
+        seen = 0
+        page = 1
+        
+        while True:
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            
+            params = self._build_params(topic, days_back, language, sort_by, page_size)
+            params["page"] = page
+            try:
+                data = self._request(params, timeout=timeout)
+            except Exception as e:
+                # Later pages can fail (e.g. the plan's result limit); keep what was already yielded
+                if page == 1:
+                    raise
+                print(f"Warning: stopped paging '{topic}' at page {page}: {e}")
+                return
+            
+            raw_articles = data.get("articles", [])
+            for article in self._process_articles(raw_articles):
+                yield article
+                yielded += 1
+                if max_articles is not None and yielded >= max_articles:
+                    return
+            
+            seen += len(raw_articles)
+            if len(raw_articles) < page_size or seen >= data.get("totalResults", 0):
+                return
+            page += 1
+
+    def _build_params(self,
+                      topic: str,
+                      days_back: int,
+                      language: str,
+                      sort_by: str,
+                      page_size: int) -> Dict[str, Any]:
+        """
+        Build the query parameters for a topic, without the API key.
         """
         # Calculate the date range
         end_date = datetime.now()
@@ -54,22 +252,88 @@ class NewsRetriever:
         to_date = end_date.strftime("%Y-%m-%d")
         
         # Prepare the API request
-        params = {
+        return {
             "q": topic,
             "from": from_date,
             "to": to_date,
             "language": language,
             "sortBy": sort_by,
-            "pageSize": page_size,
-            "apiKey": self.api_key
+            "pageSize": page_size
         }
+
+    def _request(self, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Return the response data for a query, using the response cache if configured.
+        Identical queries already in flight wait for that request instead of sending their own.
+        
+        Args:
+            params: Query parameters, without the API key.
+            timeout: Request timeout in seconds.
+            
+        Returns:
+            Parsed response data.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(params)
+            if cached is not None:
+                return cached
+        
+        return self._inflight.do(
+            make_request_key(params),
+            lambda: self._fetch_and_store(params, timeout)
+        )
+
+    def _fetch_and_store(self, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Fetch a query from the API and store the response in the cache if configured.
+        """
+        data = self._fetch(params, timeout=timeout)
+        
+        if self.cache is not None:
+            self.cache.set(params, data)
+        return data
+
+    @retry(stop=stop_after_attempt(3), wait=_wait_for_retry, retry=retry_if_exception(_should_retry))
+    def _fetch(self, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Send a query to NewsAPI with retry capability.
+        
+        Args:
+            params: Query parameters, without the API key.
+            timeout: Request timeout in seconds.
+            
+        Returns:
+            Parsed response data.
+        """
+        # Wait for a token from the shared rate limiter before touching the network
+        self.rate_limiter.acquire()
         
         # Make the API request
-        response = requests.get(self.BASE_URL, params=params)
+        response = self.session.get(
+            self.base_url,
+            params={**params, "apiKey": self.api_key},
+            timeout=timeout
+        )
+        
+        retry_after = None
+        if response.status_code == 429:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        self.rate_limiter.record_response(response.status_code, retry_after)
+        
+        # Back off instead of hammering the API when rate limited
+        if response.status_code == 429:
+            error_msg = f"Rate limited by NewsAPI: {response.status_code} - {response.text}"
+            raise RateLimitError(error_msg, retry_after=retry_after)
         
         # Check if the request was successful
         if response.status_code != 200:
             error_msg = f"Failed to retrieve articles: {response.status_code} - {response.text}"
+            if 400 <= response.status_code < 500 and response.status_code != 408:
+                try:
+                    code = response.json().get("code")
+                except ValueError:
+                    code = None
+                raise RequestRejectedError(error_msg, response.status_code, code)
             raise Exception(error_msg)
         
         # Parse the response
@@ -80,39 +344,89 @@ class NewsRetriever:
             error_msg = f"API error: {data.get('message', 'Unknown error')}"
             raise Exception(error_msg)
         
-        # Extract the articles
-        articles = data.get("articles", [])
+        return data
+
+    def _process_articles(self, articles: List[Dict[str, Any]]) -> List[Article]:
+        """
+        Normalize raw NewsAPI articles, skipping those with missing content.
         
-        # Process the articles to include only the relevant information
+        Args:
+            articles: Raw article dictionaries from the API response.
+            
+        Returns:
+            List of articles.
+        """
         processed_articles = []
         for article in articles:
             # Skip articles with missing content
             if not article.get("content") or not article.get("title"):
                 continue
                 
-            processed_article = {
-                "title": article.get("title"),
-                "author": article.get("author"),
-                "source": article.get("source", {}).get("name"),
-                "url": article.get("url"),
-                "published_at": article.get("publishedAt"),
-                "content": article.get("content"),
-                "description": article.get("description")
-            }
-            processed_articles.append(processed_article)
+            processed_articles.append(Article.from_newsapi(article))
         
         return processed_articles
 
-    def get_article_content(self, article: Dict[str, Any]) -> str:
+    def get_articles_many(self,
+                          topics: List[str],
+                          max_workers: int = 8,
+                          return_exceptions: bool = False,
+                          **kwargs) -> Dict[str, Any]:
+        """
+        Retrieve news articles for several topics concurrently.
+        
+        Each topic goes through get_articles, so the retry behavior applies per topic,
+        and a topic that still fails does not cancel the others.
+        
+        Args:
+            topics: Topics to search for.
+            max_workers: Maximum number of topics fetched at the same time.
+            return_exceptions: If True, a failed topic maps to its exception instead of an empty list.
+            **kwargs: Extra arguments passed to get_articles (days_back, language, ...).
+            
+        Returns:
+            Dictionary mapping each topic to its list of articles.
+        """
+        # Preserve order and fetch each distinct topic once
+        unique_topics = list(dict.fromkeys(topics))
+        if not unique_topics:
+            return {}
+        
+        results = {}
+        workers = max(1, min(max_workers, len(unique_topics)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                topic: executor.submit(self.get_articles, topic, **kwargs)
+                for topic in unique_topics
+            }
+            for topic, future in futures.items():
+                try:
+                    results[topic] = future.result()
+                except Exception as e:
+                    print(f"Error retrieving articles for '{topic}': {e}")
+                    results[topic] = e if return_exceptions else []
+        
+        return results
+
+    def close(self) -> None:
+        """
+        Close the pooled HTTP connections.
+        """
+        self.session.close()
+
+    def get_article_content(self, article: Union[Article, Dict[str, Any]]) -> str:
         """
         Extract the content from an article for embedding and summarization.
         
         Args:
-            article: Article dictionary.
+            article: Article or article dictionary.
             
         Returns:
             Formatted article content as a string.
         """
+        if isinstance(article, Article):
+            # Formatted once and cached on the record
+            return article.full_text
+        
         # Create a formatted version of the article content
         title = article.get("title", "")
         description = article.get("description", "")
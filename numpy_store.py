@@ -0,0 +1,450 @@
+"""
+Module for a lightweight in-memory vector store backed by a NumPy matrix.
+"""
+import os
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from quantization import SUPPORTED_DTYPES, ScalarQuantizer, recall_at_k
+
+class NumpyVectorStore(VectorStore):
+    """
+    Vector store keeping L2-normalized float32 embeddings in one contiguous matrix.
+
+    Scores are squared L2 distances between normalized vectors (2 - 2 * cosine), so lower
+    is closer, as with the Chroma and FAISS stores.
+
+    With a float16 or int8 vector_dtype, searches scan a compact copy of the matrix and
+    rescore the best candidates against the float32 rows. Loaded with mmap, the float32
+    matrix stays on disk and only the candidate rows are read.
+    """
+    EMBEDDINGS_FILE = "embeddings.npy"
+    DOCUMENTS_FILE = "documents.json"
+    CODES_FILE = "codes.npy"
+    QUANTIZER_FILE = "quantizer.npz"
+
+    def __init__(self, embedding: Embeddings, vector_dtype: str = "float32", rescore_factor: int = 4):
+        """
+        Initialize an empty NumpyVectorStore.
+
+        Args:
+            embedding: Embedding model used for texts and queries.
+            vector_dtype: Type of the scanned vectors ("float32", "float16" or "int8").
+            rescore_factor: With float16/int8, the top k * rescore_factor candidates are rescored
+                with the float32 vectors. 0 disables rescoring.
+        """
+        if vector_dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {vector_dtype}")
+        self.embedding = embedding
+        self.vector_dtype = vector_dtype
+        self.rescore_factor = rescore_factor
+        self.matrix = None
+        self.quantizer = None
+        self._codes = None
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def add_texts(self,
+                  texts: Iterable[str],
+                  metadatas: Optional[List[Dict[str, Any]]] = None,
+                  ids: Optional[List[str]] = None,
+                  **kwargs: Any) -> List[str]:
+        """
+        Embed and add texts; texts with an existing ID replace the stored one.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        vectors = self.embedding.embed_documents(texts)
+        return self.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas, ids=ids)
+
+    def add_embeddings(self,
+                       text_embeddings: Iterable[Tuple[str, List[float]]],
+                       metadatas: Optional[List[Dict[str, Any]]] = None,
+                       ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Add precomputed embeddings; entries with an existing ID replace the stored one.
+
+        Args:
+            text_embeddings: Pairs of text and embedding.
+            metadatas: Metadata per text.
+            ids: Document ID per text. If None, IDs are generated.
+
+        Returns:
+            The IDs of the added documents.
+        """
+        text_embeddings = list(text_embeddings)
+        if not text_embeddings:
+            return []
+        texts = [text for text, _ in text_embeddings]
+        vectors = self._normalize([vector for _, vector in text_embeddings])
+        metadatas = metadatas or [{} for _ in texts]
+        if ids is None:
+            start = len(self.ids)
+            ids = [f"doc-{start + i}" for i in range(len(texts))]
+
+        if self.matrix is not None and vectors.shape[1] != self.matrix.shape[1]:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match store dimension {self.matrix.shape[1]}.")
+
+        new_rows = []
+        for i, doc_id in enumerate(ids):
+            row = self._rows.get(doc_id)
+            if row is None:
+                new_rows.append(i)
+                continue
+            # Replace in place; copy first if the matrix is a read-only memory map
+            if not self.matrix.flags.writeable:
+                self.matrix = np.array(self.matrix)
+            self.matrix[row] = vectors[i]
+            self.texts[row] = texts[i]
+            self.metadatas[row] = dict(metadatas[i])
+
+        if new_rows:
+            appended = vectors[new_rows]
+            self.matrix = appended if self.matrix is None else np.concatenate([self.matrix, appended])
+            for i in new_rows:
+                self._rows[ids[i]] = len(self.ids)
+                self.ids.append(ids[i])
+                self.texts.append(texts[i])
+                self.metadatas.append(dict(metadatas[i]))
+
+        self._columns = {}
+        self._codes = None
+        return list(ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """
+        Delete documents by ID.
+        """
+        if not ids:
+            return False
+        drop = {self._rows[doc_id] for doc_id in ids if doc_id in self._rows}
+        if not drop:
+            return False
+        keep = [row for row in range(len(self.ids)) if row not in drop]
+        self.matrix = np.ascontiguousarray(self.matrix[keep]) if keep else None
+        self.ids = [self.ids[row] for row in keep]
+        self.texts = [self.texts[row] for row in keep]
+        self.metadatas = [self.metadatas[row] for row in keep]
+        self._rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        self._columns = {}
+        self._codes = None
+        return True
+
+    def get_metadata(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the metadata of a stored document, or None if the ID is unknown.
+        """
+        row = self._rows.get(doc_id)
+        return None if row is None else self.metadatas[row]
+
+    def get_embeddings(self, ids: List[str]) -> np.ndarray:
+        """
+        Get the normalized embeddings of stored documents, in the order of ids.
+        """
+        return np.asarray(self.matrix[[self._rows[doc_id] for doc_id in ids]], dtype=np.float32)
+
+    def _column(self, name: str) -> np.ndarray:
+        """
+        Metadata field as an array, built on first use after each write.
+        """
+        if name not in self._columns:
+            self._columns[name] = np.array([m.get(name) for m in self.metadatas], dtype=object)
+        return self._columns[name]
+
+    def _filter_mask(self, filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Rows matching every field of the filter; a list value matches any of its items.
+        """
+        if not filter:
+            return None
+        mask = np.ones(len(self.ids), dtype=bool)
+        for name, value in filter.items():
+            column = self._column(name)
+            if isinstance(value, (list, tuple, set)):
+                mask &= np.isin(column, list(value))
+            else:
+                mask &= column == value
+        return mask
+
+    def _top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k highest scores, best first, using argpartition.
+        """
+        k = min(k, scores.shape[0])
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if k < scores.shape[0]:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(scores.shape[0])
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def _quantized_codes(self) -> Optional[np.ndarray]:
+        """
+        Quantized copy of the matrix, re-encoded on first use after each write.
+        """
+        if self.vector_dtype == "float32" or self.matrix is None:
+            return None
+        if self._codes is None:
+            self.quantizer = ScalarQuantizer(self.vector_dtype).fit(self.matrix)
+            self._codes = self.quantizer.encode(self.matrix)
+        return self._codes
+
+    def _search_rows(self,
+                     queries: np.ndarray,
+                     k: int,
+                     filter: Optional[Dict[str, Any]] = None,
+                     exact: bool = False) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Best rows and their cosine similarities for normalized queries, best first.
+        """
+        codes = None if exact else self._quantized_codes()
+        if codes is None:
+            similarities = queries @ self.matrix.T
+        else:
+            similarities = self.quantizer.scores(codes, queries)
+        mask = self._filter_mask(filter)
+        if mask is not None:
+            similarities[:, ~mask] = -np.inf
+
+        results = []
+        for query, row_scores in zip(queries, similarities):
+            if codes is None or not self.rescore_factor:
+                top = self._top_k(row_scores, k)
+                scores = row_scores[top]
+            else:
+                # Rescore the best approximate candidates with the float32 rows
+                candidates = self._top_k(row_scores, k * self.rescore_factor)
+                candidates = np.sort(candidates[np.isfinite(row_scores[candidates])])
+                exact_scores = np.asarray(self.matrix[candidates], dtype=np.float32) @ query
+                order = self._top_k(exact_scores, k)
+                top, scores = candidates[order], exact_scores[order]
+            finite = np.isfinite(scores)
+            results.append((top[finite], scores[finite]))
+        return results
+
+    def search_vectors(self,
+                       query_vectors: np.ndarray,
+                       k: int = 4,
+                       filter: Optional[Dict[str, Any]] = None,
+                       exact: bool = False) -> List[List[Tuple[Document, float]]]:
+        """
+        Search several query vectors with a single matrix product.
+
+        Args:
+            query_vectors: Query embedding matrix, one row per query.
+            k: Number of results per query.
+            filter: Metadata filter, e.g. {"topic": "AI"} or {"source": ["Wired", "The Verge"]}.
+            exact: Scan the float32 matrix even if the store is quantized.
+
+        Returns:
+            One list of (document, distance) pairs per query.
+        """
+        queries = self._normalize(np.atleast_2d(query_vectors))
+        if self.matrix is None or not self.ids:
+            return [[] for _ in queries]
+
+        return [
+            [
+                (
+                    Document(id=self.ids[row], page_content=self.texts[row], metadata=dict(self.metadatas[row])),
+                    float(2.0 - 2.0 * score)
+                )
+                for row, score in zip(rows, scores)
+            ]
+            for rows, scores in self._search_rows(queries, k, filter=filter, exact=exact)
+        ]
+
+    def measure_recall(self, query_vectors: np.ndarray, k: int = 10) -> Dict[str, float]:
+        """
+        Compare quantized search with an exact float32 scan.
+
+        Args:
+            query_vectors: Query embedding matrix, one row per query.
+            k: Number of results per query.
+
+        Returns:
+            recall@k with and without rescoring, and the bytes of the float32 and scanned matrices.
+        """
+        queries = self._normalize(np.atleast_2d(query_vectors))
+        if self.matrix is None or not self.ids:
+            return {"recall": 1.0, "recall_without_rescoring": 1.0, "float32_bytes": 0, "scanned_bytes": 0}
+
+        exact_rows = [rows for rows, _ in self._search_rows(queries, k, exact=True)]
+        approx_rows = [rows for rows, _ in self._search_rows(queries, k)]
+        rescore_factor = self.rescore_factor
+        self.rescore_factor = 0
+        try:
+            unrescored_rows = [rows for rows, _ in self._search_rows(queries, k)]
+        finally:
+            self.rescore_factor = rescore_factor
+
+        codes = self._quantized_codes()
+        float32_bytes = int(self.matrix.size) * 4
+        return {
+            "recall": recall_at_k(exact_rows, approx_rows, k),
+            "recall_without_rescoring": recall_at_k(exact_rows, unrescored_rows, k),
+            "float32_bytes": float32_bytes,
+            "scanned_bytes": float32_bytes if codes is None else int(codes.nbytes)
+        }
+
+    def similarity_search_by_vector_with_score(self,
+                                               embedding: List[float],
+                                               k: int = 4,
+                                               filter: Optional[Dict[str, Any]] = None,
+                                               **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.search_vectors(np.asarray([embedding]), k=k, filter=filter)[0]
+
+    def similarity_search_with_score(self,
+                                     query: str,
+                                     k: int = 4,
+                                     filter: Optional[Dict[str, Any]] = None,
+                                     **kwargs: Any) -> List[Tuple[Document, float]]:
+        """
+        Search by query text, returning (document, distance) pairs, closest first.
+        """
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k=k, filter=filter)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, **kwargs)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k=k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        # Squared L2 between unit vectors lies in [0, 4]
+        return lambda distance: 1.0 - distance / 4.0
+
+    @classmethod
+    def from_texts(cls,
+                   texts: List[str],
+                   embedding: Embeddings,
+                   metadatas: Optional[List[Dict[str, Any]]] = None,
+                   ids: Optional[List[str]] = None,
+                   **kwargs: Any) -> "NumpyVectorStore":
+        store = cls(embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+    def save(self, folder_path: str) -> None:
+        """
+        Save the store: the matrix with np.save and the documents as JSON, plus the
+        quantized matrix and its parameters when vector_dtype is float16 or int8.
+
+        Args:
+            folder_path: Folder to write the store files to.
+        """
+        os.makedirs(folder_path, exist_ok=True)
+        matrix = self.matrix if self.matrix is not None else np.empty((0, 0), dtype=np.float32)
+        embeddings_path = os.path.join(folder_path, self.EMBEDDINGS_FILE)
+        # Write beside the old file and swap, so a memory map of it stays valid
+        tmp_path = embeddings_path + ".tmp.npy"
+        np.save(tmp_path, np.ascontiguousarray(matrix, dtype=np.float32))
+        os.replace(tmp_path, embeddings_path)
+
+        documents_path = os.path.join(folder_path, self.DOCUMENTS_FILE)
+        with open(documents_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"ids": self.ids, "texts": self.texts, "metadatas": self.metadatas}, f)
+        os.replace(documents_path + ".tmp", documents_path)
+
+        codes = self._quantized_codes()
+        if codes is not None:
+            codes_path = os.path.join(folder_path, self.CODES_FILE)
+            np.save(codes_path + ".tmp.npy", np.ascontiguousarray(codes))
+            os.replace(codes_path + ".tmp.npy", codes_path)
+            quantizer_path = os.path.join(folder_path, self.QUANTIZER_FILE)
+            np.savez(
+                quantizer_path + ".tmp.npz",
+                minimum=self.quantizer.minimum if self.quantizer.minimum is not None else np.empty(0, dtype=np.float32),
+                scale=self.quantizer.scale if self.quantizer.scale is not None else np.empty(0, dtype=np.float32)
+            )
+            os.replace(quantizer_path + ".tmp.npz", quantizer_path)
+        else:
+            # Do not leave quantized vectors that no longer match the matrix
+            for name in (self.CODES_FILE, self.QUANTIZER_FILE):
+                try:
+                    os.remove(os.path.join(folder_path, name))
+                except OSError:
+                    pass
+
+    @classmethod
+    def load(cls,
+             folder_path: str,
+             embedding: Embeddings,
+             mmap: bool = True,
+             vector_dtype: str = "float32",
+             rescore_factor: int = 4) -> Optional["NumpyVectorStore"]:
+        """
+        Load a saved store, memory-mapping the matrix read-only by default.
+
+        Saved quantized vectors are reused if they match vector_dtype; otherwise they are
+        re-encoded on the first search.
+
+        Args:
+            folder_path: Folder the store was saved to.
+            embedding: Embedding model used for texts and queries.
+            mmap: Whether to memory-map the matrix (np.load mmap_mode="r").
+            vector_dtype: Type of the scanned vectors ("float32", "float16" or "int8").
+            rescore_factor: Candidates per result rescored with the float32 vectors.
+
+        Returns:
+            The store, or None if nothing was saved there.
+        """
+        embeddings_path = os.path.join(folder_path, cls.EMBEDDINGS_FILE)
+        documents_path = os.path.join(folder_path, cls.DOCUMENTS_FILE)
+        if not os.path.exists(embeddings_path) or not os.path.exists(documents_path):
+            return None
+
+        store = cls(embedding, vector_dtype=vector_dtype, rescore_factor=rescore_factor)
+        with open(documents_path, "r", encoding="utf-8") as f:
+            documents = json.load(f)
+        store.ids = documents["ids"]
+        store.texts = documents["texts"]
+        store.metadatas = documents["metadatas"]
+        store._rows = {doc_id: row for row, doc_id in enumerate(store.ids)}
+        if store.ids:
+            store.matrix = np.load(embeddings_path, mmap_mode="r" if mmap else None)
+            store._load_codes(folder_path, mmap)
+        return store
+
+    def _load_codes(self, folder_path: str, mmap: bool) -> None:
+        """
+        Load saved quantized vectors if they match the matrix and vector_dtype.
+        """
+        codes_path = os.path.join(folder_path, self.CODES_FILE)
+        quantizer_path = os.path.join(folder_path, self.QUANTIZER_FILE)
+        if self.vector_dtype == "float32" or not os.path.exists(codes_path) or not os.path.exists(quantizer_path):
+            return
+        codes = np.load(codes_path, mmap_mode="r" if mmap else None)
+        if codes.dtype != np.dtype(self.vector_dtype) or codes.shape != self.matrix.shape:
+            return
+        with np.load(quantizer_path) as params:
+            quantizer = ScalarQuantizer(self.vector_dtype)
+            if self.vector_dtype == "int8":
+                quantizer.minimum = params["minimum"]
+                quantizer.scale = params["scale"]
+        self.quantizer = quantizer
+        self._codes = codes
@@ -0,0 +1,136 @@
+"""
+Module for sharing long-lived pipeline components across commands.
+"""
+import threading
+from typing import TYPE_CHECKING, Optional
+
+# Components are imported when first built: the embedding and summarization stacks take
+# seconds to import, and commands that only touch user preferences never need them
+if TYPE_CHECKING:
+    from news_retriever import NewsRetriever
+    from embedding_engine import EmbeddingEngine
+    from dedup import Deduplicator
+    from summarizer import ArticleSummarizer
+
+class NewsPipeline:
+    """
+    Application context that builds the retrieval, embedding and summarization
+    components once and shares them across commands and entry points.
+    """
+    def __init__(self,
+                news_api_key: Optional[str] = None,
+                news_api_base_url: Optional[str] = None,
+                huggingface_token: Optional[str] = None,
+                vector_store_type: str = "chroma",
+                persist_directory: str = "./vector_db",
+                unified_index: bool = False,
+                cache_directory: Optional[str] = "./.news_cache",
+                cache_ttl_seconds: float = 900,
+                watermark_file: Optional[str] = "watermarks.json",
+                fingerprint_file: Optional[str] = "fingerprints.json",
+                dedup_embedding_threshold: Optional[float] = None):
+        """
+        Initialize the NewsPipeline. Components are created on first use.
+
+        Args:
+            news_api_key: NewsAPI key. If None, NewsRetriever reads NEWSAPI_KEY.
+            news_api_base_url: NewsAPI endpoint. If None, NewsRetriever reads NEWSAPI_BASE_URL or uses the public API.
+            huggingface_token: HuggingFace API token. If None, ArticleSummarizer reads HUGGINGFACEHUB_API_TOKEN.
+            vector_store_type: Type of vector store to use ("chroma" or "faiss").
+            persist_directory: Directory to persist vector stores.
+            unified_index: Keep all topics in one vector store filtered by topic metadata.
+            cache_directory: Directory for cached NewsAPI responses. If None, responses are not cached.
+            cache_ttl_seconds: Seconds a cached NewsAPI response stays valid.
+            watermark_file: JSON file tracking the newest article seen per topic. If None, kept in memory.
+            fingerprint_file: JSON file of the duplicate-detection fingerprints. If None, kept in memory.
+            dedup_embedding_threshold: Cosine similarity at which articles of a batch count as duplicates.
+                If None, only URLs and SimHash fingerprints are compared.
+        """
+        self.news_api_key = news_api_key
+        self.news_api_base_url = news_api_base_url
+        self.huggingface_token = huggingface_token
+        self.vector_store_type = vector_store_type
+        self.persist_directory = persist_directory
+        self.unified_index = unified_index
+        self.cache_directory = cache_directory
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.watermark_file = watermark_file
+        self.fingerprint_file = fingerprint_file
+        self.dedup_embedding_threshold = dedup_embedding_threshold
+
+        self._news_retriever = None
+        self._embedding_engine = None
+        self._summarizer = None
+        self._deduplicator = None
+        self._lock = threading.Lock()
+
+    @property
+    def news_retriever(self) -> "NewsRetriever":
+        """
+        Shared NewsRetriever instance.
+        """
+        if self._news_retriever is None:
+            with self._lock:
+                if self._news_retriever is None:
+                    from news_retriever import NewsRetriever
+                    from response_cache import ResponseCache
+                    from watermark_store import WatermarkStore
+                    cache = None
+                    if self.cache_directory:
+                        cache = ResponseCache(
+                            cache_directory=self.cache_directory,
+                            ttl_seconds=self.cache_ttl_seconds
+                        )
+                    self._news_retriever = NewsRetriever(
+                        api_key=self.news_api_key,
+                        base_url=self.news_api_base_url,
+                        cache=cache,
+                        watermarks=WatermarkStore(storage_file=self.watermark_file)
+                    )
+        return self._news_retriever
+
+    @property
+    def embedding_engine(self) -> "EmbeddingEngine":
+        """
+        Shared EmbeddingEngine instance. The embedding model is loaded only once.
+        """
+        if self._embedding_engine is None:
+            with self._lock:
+                if self._embedding_engine is None:
+                    from embedding_engine import EmbeddingEngine
+                    self._embedding_engine = EmbeddingEngine(
+                        vector_store_type=self.vector_store_type,
+                        persist_directory=self.persist_directory,
+                        unified=self.unified_index
+                    )
+        return self._embedding_engine
+
+    @property
+    def deduplicator(self) -> "Deduplicator":
+        """
+        Shared Deduplicator instance, applied between retrieval and embedding.
+        """
+        if self._deduplicator is None:
+            # Resolve the engine before taking the lock; its property takes the same lock
+            embeddings = self.embedding_engine.embedding_model if self.dedup_embedding_threshold is not None else None
+            with self._lock:
+                if self._deduplicator is None:
+                    from dedup import Deduplicator
+                    self._deduplicator = Deduplicator(
+                        storage_file=self.fingerprint_file,
+                        embeddings=embeddings,
+                        embedding_threshold=self.dedup_embedding_threshold
+                    )
+        return self._deduplicator
+
+    @property
+    def summarizer(self) -> "ArticleSummarizer":
+        """
+        Shared ArticleSummarizer instance. The LLM endpoint is built only once.
+        """
+        if self._summarizer is None:
+            with self._lock:
+                if self._summarizer is None:
+                    from summarizer import ArticleSummarizer
+                    self._summarizer = ArticleSummarizer(huggingface_token=self.huggingface_token)
+        return self._summarizer
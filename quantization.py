@@ -0,0 +1,117 @@
+"""
+Module for compact (float16 / int8) embedding storage and recall measurement.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+
+class ScalarQuantizer:
+    """
+    Class for encoding float32 embeddings as float16 or per-dimension scalar-quantized int8.
+    """
+    def __init__(self, dtype: str = "int8", chunk_size: int = 65536):
+        """
+        Initialize the ScalarQuantizer.
+
+        Args:
+            dtype: Storage type, "float16" or "int8".
+            chunk_size: Rows decoded at a time when scoring, bounding temporary memory.
+        """
+        if dtype not in ("float16", "int8"):
+            raise ValueError(f"Unsupported quantization dtype: {dtype}")
+        self.dtype = dtype
+        self.chunk_size = chunk_size
+        self.minimum = None
+        self.scale = None
+
+    def fit(self, vectors: np.ndarray) -> "ScalarQuantizer":
+        """
+        Learn the per-dimension value range used by int8 codes.
+
+        Args:
+            vectors: Embedding matrix.
+
+        Returns:
+            The fitted quantizer.
+        """
+        if self.dtype == "int8":
+            vectors = np.asarray(vectors, dtype=np.float32)
+            self.minimum = vectors.min(axis=0)
+            span = vectors.max(axis=0) - self.minimum
+            span[span == 0] = 1.0
+            self.scale = (span / 255.0).astype(np.float32)
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Encode float32 vectors.
+
+        Args:
+            vectors: Embedding matrix.
+
+        Returns:
+            Codes of the configured dtype.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dtype == "float16":
+            return vectors.astype(np.float16)
+        levels = np.rint((vectors - self.minimum) / self.scale)
+        return (np.clip(levels, 0, 255) - 128).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Approximately reconstruct float32 vectors from codes.
+        """
+        if self.dtype == "float16":
+            return codes.astype(np.float32)
+        return (codes.astype(np.float32) + 128.0) * self.scale + self.minimum
+
+    def scores(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """
+        Approximate inner products between queries and encoded vectors.
+
+        For int8, q . x = (q * scale) . (c + 128) + q . min, so only the codes are read and
+        no float32 copy of the whole matrix is made.
+
+        Args:
+            codes: Encoded matrix, one row per stored vector.
+            queries: Query matrix, one row per query.
+
+        Returns:
+            Score matrix of shape (queries, stored vectors).
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        result = np.empty((queries.shape[0], codes.shape[0]), dtype=np.float32)
+        if self.dtype == "int8":
+            weighted = queries * self.scale
+            bias = weighted.sum(axis=1, keepdims=True) * 128.0 + queries @ self.minimum[:, None]
+        for start in range(0, codes.shape[0], self.chunk_size):
+            chunk = codes[start:start + self.chunk_size].astype(np.float32)
+            if self.dtype == "float16":
+                result[:, start:start + len(chunk)] = queries @ chunk.T
+            else:
+                result[:, start:start + len(chunk)] = weighted @ chunk.T + bias
+        return result
+
+def recall_at_k(exact_ids: Sequence[Sequence], approx_ids: Sequence[Sequence], k: Optional[int] = None) -> float:
+    """
+    Fraction of the exact top-k neighbors that the approximate search also returned.
+
+    Args:
+        exact_ids: Exact top-k IDs per query.
+        approx_ids: Approximate top-k IDs per query.
+        k: Cut-off. If None, the length of each exact list is used.
+
+    Returns:
+        Mean recall@k over the queries.
+    """
+    recalls = []
+    for exact, approx in zip(exact_ids, approx_ids):
+        exact = list(exact)[:k] if k else list(exact)
+        if not exact:
+            continue
+        approx = set(list(approx)[:k] if k else approx)
+        recalls.append(sum(1 for item in exact if item in approx) / len(exact))
+    return float(np.mean(recalls)) if recalls else 1.0
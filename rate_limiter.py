@@ -0,0 +1,198 @@
+"""
+Module for client-side rate limiting and quota tracking of NewsAPI requests.
+"""
+import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+class RateLimitError(Exception):
+    """
+    Raised when the API answers 429 Too Many Requests.
+    """
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class QuotaExceededError(Exception):
+    """
+    Raised when the local daily quota is used up, before any request is sent.
+    """
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into seconds.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with daily quota accounting, shared by all callers in the process.
+    """
+    def __init__(self,
+                requests_per_second: float = 2.0,
+                burst: int = 10,
+                daily_quota: Optional[int] = None,
+                cooldown_seconds: float = 30.0):
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            requests_per_second: Sustained rate at which tokens are refilled.
+            burst: Bucket capacity, i.e. how many requests may be sent back to back.
+            daily_quota: Maximum requests per UTC day. If None, only the rate is limited.
+            cooldown_seconds: Pause after a 429 response that carries no Retry-After header.
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive.")
+        self.requests_per_second = requests_per_second
+        self.burst = max(1, burst)
+        self.daily_quota = daily_quota
+        self.cooldown_seconds = cooldown_seconds
+
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._quota_day = self._today()
+        self._lock = threading.Lock()
+
+        self._counters = {
+            "requests_sent": 0,
+            "responses_ok": 0,
+            "responses_failed": 0,
+            "rate_limited": 0,
+            "quota_rejected": 0,
+            "throttled_seconds": 0.0,
+            "requests_today": 0
+        }
+
+    def _today(self) -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _refill(self, now: float) -> None:
+        """
+        Add the tokens earned since the last refill. Caller must hold the lock.
+        """
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.requests_per_second)
+        self._last_refill = now
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until a request may be sent, and count it against the quota.
+
+        Args:
+            timeout: Maximum seconds to wait. If None, wait as long as needed.
+
+        Raises:
+            QuotaExceededError: If the daily quota is used up.
+            RateLimitError: If no token becomes available within the timeout.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        waited = 0.0
+        while True:
+            with self._lock:
+                today = self._today()
+                if today != self._quota_day:
+                    self._quota_day = today
+                    self._counters["requests_today"] = 0
+
+                if self.daily_quota is not None and self._counters["requests_today"] >= self.daily_quota:
+                    self._counters["quota_rejected"] += 1
+                    raise QuotaExceededError(
+                        f"Daily NewsAPI quota of {self.daily_quota} requests is used up."
+                    )
+
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._counters["requests_sent"] += 1
+                    self._counters["requests_today"] += 1
+                    self._counters["throttled_seconds"] += waited
+                    return
+
+                delay = max(self._paused_until - now, (1 - self._tokens) / self.requests_per_second)
+
+            if deadline is not None and time.monotonic() + delay > deadline:
+                with self._lock:
+                    self._counters["throttled_seconds"] += waited
+                raise RateLimitError("Timed out waiting for the client-side rate limiter.", retry_after=delay)
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop all callers from sending requests for a while, e.g. after a Retry-After.
+
+        Args:
+            seconds: Seconds to hold back requests.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def record_response(self, status_code: int, retry_after: Optional[float] = None) -> None:
+        """
+        Account for a response received from the API.
+
+        Args:
+            status_code: HTTP status code of the response.
+            retry_after: Parsed Retry-After seconds, for 429 responses.
+        """
+        with self._lock:
+            if status_code == 200:
+                self._counters["responses_ok"] += 1
+            elif status_code == 429:
+                self._counters["rate_limited"] += 1
+            else:
+                self._counters["responses_failed"] += 1
+        if status_code == 429:
+            self.pause(retry_after if retry_after is not None else self.cooldown_seconds)
+
+    def counters(self) -> Dict[str, float]:
+        """
+        Get a snapshot of the request and quota counters.
+
+        Returns:
+            Dictionary of counter names to values.
+        """
+        with self._lock:
+            snapshot = dict(self._counters)
+        if self.daily_quota is not None:
+            snapshot["quota_remaining"] = max(0, self.daily_quota - snapshot["requests_today"])
+        return snapshot
+
+_shared_rate_limiter = None
+_shared_lock = threading.Lock()
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide RateLimiter used by default by every NewsRetriever.
+
+    Returns:
+        The shared RateLimiter instance.
+    """
+    global _shared_rate_limiter
+    if _shared_rate_limiter is None:
+        with _shared_lock:
+            if _shared_rate_limiter is None:
+                _shared_rate_limiter = RateLimiter()
+    return _shared_rate_limiter
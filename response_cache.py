@@ -0,0 +1,181 @@
+"""
+Module for caching NewsAPI responses on disk.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+# Request parameters that identify a query; anything else (e.g. apiKey) is ignored
+KEY_PARAMS = ("q", "from", "to", "language", "sortBy", "pageSize", "page")
+
+def make_request_key(params: Dict[str, Any]) -> str:
+    """
+    Build a stable key from the normalized query parameters.
+
+    Args:
+        params: Request parameters.
+
+    Returns:
+        Hex digest identifying the query.
+    """
+    normalized = {}
+    for name in KEY_PARAMS:
+        value = params.get(name)
+        if value is None:
+            continue
+        if name == "q":
+            # NewsAPI matching is case-insensitive, so "AI" and "ai" share a key
+            value = " ".join(str(value).split()).lower()
+        normalized[name] = str(value)
+    payload = json.dumps(normalized, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    Class for caching API responses on disk with a TTL and size-bounded eviction.
+    """
+    def __init__(self,
+                cache_directory: str = "./.news_cache",
+                ttl_seconds: float = 900,
+                max_entries: int = 1000,
+                max_bytes: int = 50 * 1024 * 1024):
+        """
+        Initialize the ResponseCache.
+
+        Args:
+            cache_directory: Directory where cached responses are stored.
+            ttl_seconds: Seconds a cached response stays valid.
+            max_entries: Maximum number of cached responses kept on disk.
+            max_bytes: Maximum total size of cached responses on disk.
+        """
+        self.cache_directory = cache_directory
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_directory, exist_ok=True)
+
+        # key -> (created_at, size in bytes), rebuilt from the files already on disk
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, tuple]:
+        """
+        Scan the cache directory for existing entries.
+        """
+        index = {}
+        for name in os.listdir(self.cache_directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            index[name[:-5]] = (stat.st_mtime, stat.st_size)
+        return index
+
+    def make_key(self, params: Dict[str, Any]) -> str:
+        """
+        Build a stable cache key from the normalized query parameters.
+
+        Args:
+            params: Request parameters.
+
+        Returns:
+            Hex digest identifying the query.
+        """
+        return make_request_key(params)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_directory, f"{key}.json")
+
+    def get(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            params: Request parameters.
+
+        Returns:
+            The cached response data, or None if missing or expired.
+        """
+        key = self.make_key(params)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry[0] > self.ttl_seconds:
+                self._remove(key)
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "r") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                # Treat unreadable entries as missing
+                self._remove(key)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return data
+
+    def set(self, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """
+        Store a response in the cache.
+
+        Args:
+            params: Request parameters.
+            data: Parsed response data.
+        """
+        key = self.make_key(params)
+        encoded = json.dumps(data).encode("utf-8")
+        with self._lock:
+            path = self._path(key)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+            self._index[key] = (time.time(), len(encoded))
+            self._evict()
+
+    def _remove(self, key: str) -> None:
+        """
+        Remove an entry from the index and disk. Caller must hold the lock.
+        """
+        self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """
+        Drop expired entries, then the oldest ones until the size limits hold. Caller must hold the lock.
+        """
+        now = time.time()
+        for key in [k for k, (created, _) in self._index.items() if now - created > self.ttl_seconds]:
+            self._remove(key)
+
+        total_bytes = sum(size for _, size in self._index.values())
+        if len(self._index) <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        for key in sorted(self._index, key=lambda k: self._index[k][0]):
+            if len(self._index) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            total_bytes -= self._index[key][1]
+            self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Remove all cached responses.
+        """
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
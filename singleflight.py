@@ -0,0 +1,69 @@
+"""
+Module for coalescing identical concurrent calls into a single execution.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class _Call:
+    """
+    An in-flight call whose result is shared by every waiter.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Class that runs a function once per key while it is in flight and shares the outcome.
+    """
+    def __init__(self):
+        """
+        Initialize the SingleFlight group.
+        """
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn for key, or wait for the identical call already in flight.
+
+        Args:
+            key: Identifies calls that may share a result.
+            fn: Function to run if no call for key is in flight.
+
+        Returns:
+            The result of fn. If fn raised, every caller gets the same exception.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            # Later callers start a fresh call; the result is not cached here
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
@@ -3,8 +3,6 @@ Module for implementing improved LangChain summarization chains.
 """
 import os
 from typing import List, Dict, Any
-from langchain_huggingface import HuggingFaceEndpoint
-from langchain.chains.summarize import load_summarize_chain
 from langchain_core.prompts import PromptTemplate
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
@@ -28,6 +26,9 @@ class ArticleSummarizer:
         if not self.huggingface_token:
             raise ValueError("HuggingFace API token is required. Please provide it or set HUGGINGFACEHUB_API_TOKEN environment variable.")
         
+        # Imported here so loading this module does not pull in the HuggingFace stack
+        from langchain_huggingface import HuggingFaceEndpoint
+        
         # Use a more reliable model with simpler parameters
         try:
             self.llm = HuggingFaceEndpoint(
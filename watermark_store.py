@@ -0,0 +1,95 @@
+"""
+Module for tracking the newest article seen per topic.
+"""
+import os
+import json
+import threading
+from typing import Dict, Optional
+
+class WatermarkStore:
+    """
+    Class for tracking the newest `published_at` timestamp seen per topic.
+    """
+    def __init__(self, storage_file: Optional[str] = "watermarks.json"):
+        """
+        Initialize the WatermarkStore with a storage file.
+
+        Args:
+            storage_file: Path to the JSON file for storing watermarks. If None, watermarks are kept in memory only.
+        """
+        self.storage_file = storage_file
+        self._lock = threading.Lock()
+        self.watermarks = self._load_data()
+
+    def _load_data(self) -> Dict[str, str]:
+        """
+        Load watermarks from the storage file.
+
+        Returns:
+            Dictionary mapping normalized topics to ISO 8601 timestamps.
+        """
+        if self.storage_file and os.path.exists(self.storage_file):
+            try:
+                with open(self.storage_file, "r") as f:
+                    return json.load(f)
+            except json.JSONDecodeError:
+                # Start over if the file is corrupted
+                return {}
+        return {}
+
+    def _save_data(self) -> None:
+        """
+        Save watermarks to the storage file.
+        """
+        if not self.storage_file:
+            return
+        with open(self.storage_file, "w") as f:
+            json.dump(self.watermarks, f, indent=2)
+
+    def _normalize_topic(self, topic: str) -> str:
+        return " ".join(topic.split()).lower()
+
+    def get(self, topic: str) -> Optional[str]:
+        """
+        Get the newest `published_at` seen for a topic.
+
+        Args:
+            topic: Topic to look up.
+
+        Returns:
+            ISO 8601 timestamp, or None if the topic was never fetched.
+        """
+        with self._lock:
+            return self.watermarks.get(self._normalize_topic(topic))
+
+    def update(self, topic: str, published_at: Optional[str]) -> None:
+        """
+        Advance the watermark for a topic if the timestamp is newer.
+
+        Args:
+            topic: Topic to update.
+            published_at: ISO 8601 timestamp of an article.
+        """
+        if not published_at:
+            return
+        key = self._normalize_topic(topic)
+        with self._lock:
+            current = self.watermarks.get(key)
+            # NewsAPI timestamps are UTC ISO 8601 strings, so they order lexicographically
+            if current is None or published_at > current:
+                self.watermarks[key] = published_at
+                self._save_data()
+
+    def reset(self, topic: Optional[str] = None) -> None:
+        """
+        Forget the watermark for a topic, or for all topics.
+
+        Args:
+            topic: Topic to reset. If None, all watermarks are cleared.
+        """
+        with self._lock:
+            if topic is None:
+                self.watermarks = {}
+            else:
+                self.watermarks.pop(self._normalize_topic(topic), None)
+            self._save_data()